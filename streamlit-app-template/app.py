@@ -1,42 +1,62 @@
 import os
 import sys
 import html
+import json
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
 
 import streamlit as st  # type: ignore
-import pandas as pd  # type: ignore
-from PIL import Image  # type: ignore
-from io import BytesIO
-import base64
 
 from utils import (
     normalize_brief as _normalize_brief,
-    get_handoff_output,
     get_compliance_from_uc_timeout,
-    get_generated_image_b64_from_uc,
+    get_generated_image_bytes_from_uc,
     get_expert_prompt_from_uc,
     generate_approval_checklist_from_compliance,
-    get_analysis_output,
+    get_brief_bundle,
+    UCConnectionError,
 )
-from config import get_data_source, get_creative_briefs_table
+from config import get_data_source, get_creative_briefs_table, get_dashboard_url
 from datasource import PlaceholderDataSource
 
 
 APP_BASE_DIR = os.path.dirname(__file__)
-_provider = get_data_source()
+
+
+@st.cache_resource(show_spinner=False)
+def _data_source():
+    # One provider per process so its Databricks connection outlives a rerun
+    return get_data_source()
+
+
+@st.cache_resource(show_spinner=False)
+def _is_placeholder() -> bool:
+    # Evaluated once per process alongside the cached provider
+    return isinstance(_data_source(), PlaceholderDataSource)
+
 
 if APP_BASE_DIR and APP_BASE_DIR not in sys.path:
     # Ensure local module imports (utils, config, datasource) work when run as a script
     sys.path.insert(0, APP_BASE_DIR)
 
-def _load_icon():
+@st.cache_resource(show_spinner=False)
+def _brand_logo() -> Optional[Any]:
+    # Decoded once per process and shared by the page icon and the header
     try:
-        _flo_logo_path = os.path.join(APP_BASE_DIR, "images", "brand_logo.png")
-        return Image.open(_flo_logo_path)
+        from PIL import Image  # type: ignore
+
+        logo = Image.open(os.path.join(APP_BASE_DIR, "images", "brand_logo.png"))
+        logo.load()
+        return logo
     except Exception:
-        return "🎯"
+        return None
+
+
+def _load_icon():
+    return _brand_logo() or "🎯"
 
 
 st.set_page_config(
@@ -47,35 +67,51 @@ st.set_page_config(
 )
 
 
-def load_css():
-    candidates = ["style.css", "style_css.css", "styles.css"]
-    for name in candidates:
-        css_file = os.path.join(APP_BASE_DIR, name)
+CSS_CANDIDATES = [os.path.join(APP_BASE_DIR, name) for name in ("style.css", "style_css.css", "styles.css")]
+
+
+@st.cache_data(show_spinner=False)
+def _css_payload() -> str:
+    for css_file in CSS_CANDIDATES:
         try:
             with open(css_file, "r") as f:
-                st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
-                return
+                return f"<style>{f.read()}</style>"
         except FileNotFoundError:
             continue
-    st.warning("CSS file not found (tried style.css, style_css.css, styles.css). Using default styles.")
+    return ""
+
+
+def load_css():
+    payload = _css_payload()
+    if payload:
+        st.markdown(payload, unsafe_allow_html=True)
+    else:
+        st.warning("CSS file not found (tried style.css, style_css.css, styles.css). Using default styles.")
 
 
 load_css()
 
 # ===================== Session State =====================
+INITIAL_WORKFLOW_STATE = {
+    "step": 0,
+    "agent": "idle",
+    "briefing_approved": False,
+    "production_approved": False,
+    "compliance_approved": False,
+    "handoff_approved": False,
+    "analysis_complete": False,
+}
+
+
+def _initial_workflow_state() -> Dict[str, Any]:
+    # Shallow copy of the template plus a fresh list, so sessions never share "messages"
+    return {**INITIAL_WORKFLOW_STATE, "messages": []}
+
+
 if "campaign_id" not in st.session_state:
     st.session_state.campaign_id = None
 if "workflow_state" not in st.session_state:
-    st.session_state.workflow_state = {
-        "step": 0,
-        "agent": "idle",
-        "briefing_approved": False,
-        "production_approved": False,
-        "compliance_approved": False,
-        "handoff_approved": False,
-        "analysis_complete": False,
-        "messages": [],
-    }
+    st.session_state.workflow_state = _initial_workflow_state()
 if "approval_feedback" not in st.session_state:
     st.session_state.approval_feedback = {}
 if "compliance_result" not in st.session_state:
@@ -91,19 +127,180 @@ DEFAULT_BRIEF = {
 if "campaign_brief" not in st.session_state:
     st.session_state.campaign_brief = DEFAULT_BRIEF.copy()
 
+WORKFLOW_TABS = ["📝 Briefing", "🎨 Production", "✅ Compliance", "🚀 Handoff", "📊 Analysis"]
+
+PRODUCTION_STAGES = [
+    ("Analyzing", "Analyzing prompt and context..."),
+    ("Applying Guidelines", "Applying brand and compliance guidelines..."),
+    ("Generating", "Generating creative with model..."),
+    ("Optimizing", "Optimizing colors, layout, and composition..."),
+    ("Finalizing", "Finalizing output and preparing preview..."),
+]
+
+# ===================== HTML fragments =====================
+# Row templates are formatted once here; render paths only .format() and join them
+# Styling lives in style.css; the markup only carries class names
+CHANNEL_CHIP_HTML = "<span class='channel-chip'>{}</span>"
+MONITOR_ITEM_HTML = "<li>{}</li>"
+OWNER_CARD_HTML = (
+    "<div class='owner-card'><div class='owner-channel'>{}</div>"
+    "<div class='owner-name'>{}</div><div class='owner-role'>{}</div></div>"
+)
+FINDING_ITEM_HTML = "<li>{}</li>"
+DASHBOARD_HEIGHT = 1500
+DASHBOARD_HOST_SUFFIXES = (".databricks.com", ".azuredatabricks.net")
+DASHBOARD_HEADER_HTML = (
+    "<hr><h5>Performance Insight Dashboard</h5>"
+    "<p class='dash-caption'>Overview of media spend and revenue across all active marketing campaigns</p>"
+)
+
+PRELAUNCH_CHECKLIST = [
+    ("Campaign assets approved & uploaded", False),
+    ("Tracking parameters configured", False),
+    ("Compliance notes shared with owners", False),
+    ("Team assignments confirmed", False),
+    ("Budget limits set in ad platforms", False),
+]
+PRELAUNCH_CHECKLIST_HTML = (
+    "<div class='checklist'>"
+    + "".join(
+        f"<div class='checklist-row'><span class='{'check-done' if completed else 'check-pending'}'>"
+        f"{'✅' if completed else '⏳'}</span>{html.escape(item)}</div>"
+        for item, completed in PRELAUNCH_CHECKLIST
+    )
+    + "</div>"
+)
+
 
 # ===================== Helpers =====================
 def normalize_brief(brief: dict) -> dict:
     return _normalize_brief(brief, DEFAULT_BRIEF)
 
 
+def _to_list(v):
+    if v is None:
+        return []
+    if isinstance(v, list):
+        return [str(x) for x in v]
+    s = str(v).strip()
+    if s.startswith("["):
+        try:
+            parsed = json.loads(s)
+            if isinstance(parsed, list):
+                return [str(x) for x in parsed]
+        except Exception:
+            pass
+    if "," in s:
+        return [p.strip() for p in s.split(",") if p.strip()]
+    return [s] if s else []
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_list_campaigns() -> List[Dict[str, Any]]:
+    # Campaign briefs change rarely; fetch once per TTL instead of on every rerun
+    return _data_source().list_campaigns() or []
+
+
+def _join_listish(value: Any) -> str:
+    return ", ".join(value) if isinstance(value, list) else str(value or "-")
+
+
+def render_campaign_summary(meta: Dict[str, Any], campaign_type: Any) -> None:
+    # Whole card in one element so the card wrapper actually encloses the grid
+    items = [
+        ("Title", meta.get("brief_title", "-") or "-"),
+        ("Campaign", meta.get("campaign_name", "-") or "-"),
+        ("Type", campaign_type or "-"),
+        ("Lifecycle", str(meta.get("lifecycle_stage") or "-")),
+        ("Medical Constraints", _join_listish(meta.get("medical_constraints"))),
+        ("Legal Requirements", _join_listish(meta.get("legal_requirements"))),
+    ]
+    grid = "".join(
+        f"<div class='brief-item'><div class='brief-item-label'>{label}</div>"
+        f"<div class='brief-item-value'>{html.escape(str(value))}</div></div>"
+        for label, value in items
+    )
+    st.markdown(
+        "<div class='card'><h5>Campaign Summary</h5>"
+        f"<div class='brief-grid' style='margin-top:8px;'>{grid}</div></div>",
+        unsafe_allow_html=True,
+    )
+
+
+def _is_dashboard_url(url: str) -> bool:
+    """Only embed https URLs on a Databricks workspace host."""
+    parsed = urlparse(url)
+    return parsed.scheme == "https" and (parsed.hostname or "").endswith(DASHBOARD_HOST_SUFFIXES)
+
+
+@st.cache_resource(show_spinner=False)
+def _dashboard_block() -> Optional[tuple]:
+    """
+    (iframe_html, height) for the Analysis dashboard, or None when no valid URL is configured.
+    The URL is fixed for the process, so the markup is built once instead of on every rerun.
+    """
+    url = get_dashboard_url()
+    if not (url and _is_dashboard_url(url)):
+        return None
+    return (
+        f'<iframe src="{html.escape(url, quote=True)}" width="100%" '
+        f'height="{DASHBOARD_HEIGHT}" frameborder="0" loading="lazy" fetchpriority="low" '
+        'referrerpolicy="no-referrer-when-downgrade"></iframe>',
+        DASHBOARD_HEIGHT,
+    )
+
+
+def _mini_table_html(headers: List[str], rows: List[tuple]) -> str:
+    # Static HTML table for the handful-of-rows tables; no grid component to mount
+    head = "".join(f"<th>{html.escape(h)}</th>" for h in headers)
+    body = "".join(
+        "<tr>" + "".join(f"<td>{html.escape(str(v if v is not None else '-'))}</td>" for v in row) + "</tr>"
+        for row in rows
+    )
+    return f"<table class='mini-table'><thead><tr>{head}</tr></thead><tbody>{body}</tbody></table>"
+
+
+@st.cache_resource(show_spinner=False)
+def _fetch_executor() -> ThreadPoolExecutor:
+    # Shared across sessions for overlapping independent provider lookups
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="fetch")
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _brief_bundle(brief_id: str) -> Dict[str, Any]:
+    # Handoff and Analysis share one provider round-trip per brief
+    return get_brief_bundle(brief_id)
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _handoff_view(brief_id: str) -> Dict[str, Any]:
+    # Escaping and row markup happen once per brief here, not on every rerun
+    data = dict((_brief_bundle(brief_id).get("handoff") or {}).get("output", {}) or {})
+    channels = data.get("channels", []) or []
+    monitors = data.get("monitoring_metrics", []) or []
+    assignees = data.get("assignees", {}) or {}
+    data["channels_html"] = " ".join(CHANNEL_CHIP_HTML.format(html.escape(str(c))) for c in channels)
+    data["monitors_html"] = (
+        "<ul class='monitor-list'>"
+        + "".join(MONITOR_ITEM_HTML.format(html.escape(str(m))) for m in monitors)
+        + "</ul>"
+    ) if monitors else ""
+    owner_parts = []
+    for channel, owner in assignees.items():
+        owner_name = str(owner).split("(")[0].strip() if "(" in str(owner) else str(owner)
+        owner_role = str(owner).split("(")[1].rstrip(")") if "(" in str(owner) else ""
+        owner_parts.append(OWNER_CARD_HTML.format(html.escape(str(channel)), html.escape(owner_name), html.escape(owner_role)))
+    data["owners_html"] = "".join(owner_parts)
+    return data
+
 
 def render_header():
     col1, col2, col3 = st.columns([1, 3, 1])
     with col1:
-        try:
-            st.image(os.path.join(APP_BASE_DIR, "images", "brand_logo.png"), width=120)
-        except Exception:
+        logo = _brand_logo()
+        if logo is not None:
+            st.image(logo, width=120)
+        else:
             st.markdown("### 🎯 Flo")
     with col2:
         st.title("Campaign Workflow Automation")
@@ -113,65 +310,115 @@ def render_header():
             st.metric("Campaign ID", st.session_state.campaign_id)
 
 
-def render_workflow_progress():
-    steps = [("📋", "Briefing"), ("🎨", "Production"), ("✅", "Compliance"), ("🚀", "Handoff"), ("📊", "Analysis")]
-    current = st.session_state.workflow_state["step"]
+WORKFLOW_STEPS = [("📋", "Briefing"), ("🎨", "Production"), ("✅", "Compliance"), ("🚀", "Handoff"), ("📊", "Analysis")]
+
 
-    st.markdown('<div class="workflow-stepper-container">', unsafe_allow_html=True)
+@st.cache_data(show_spinner=False)
+def _progress_html(current: int) -> str:
+    # Depends only on the step index: one cached variant per step, reused across reruns
     parts = []
-    for idx, (icon, _) in enumerate(steps):
+    for idx, (icon, _) in enumerate(WORKFLOW_STEPS):
         cls = "workflow-step"
         if idx < current:
             cls += " complete"
         elif idx == current:
             cls += " active"
         parts.append(f"<div class='{cls}'>{icon}</div>")
-        if idx < len(steps) - 1:
+        if idx < len(WORKFLOW_STEPS) - 1:
             conn_cls = "workflow-connector"
             if idx < current:
                 conn_cls += " complete"
             parts.append(f"<div class='{conn_cls}'><div class='progress'></div></div>")
-    st.markdown(f'<div class="workflow-stepper">{"".join(parts)}</div>', unsafe_allow_html=True)
     lbls = []
-    for idx, (_, name) in enumerate(steps):
+    for idx, (_, name) in enumerate(WORKFLOW_STEPS):
         lcls = "workflow-label"
         if idx < current:
             lcls += " complete"
         elif idx == current:
             lcls += " active"
         lbls.append(f"<div class='{lcls}'>{name}</div>")
-    st.markdown(f'<div class="workflow-labels">{"".join(lbls)}</div>', unsafe_allow_html=True)
-    st.markdown("</div>", unsafe_allow_html=True)
+    return (
+        '<div class="workflow-stepper-container">'
+        f'<div class="workflow-stepper">{"".join(parts)}</div>'
+        f'<div class="workflow-labels">{"".join(lbls)}</div>'
+        "</div>"
+    )
 
 
+def render_workflow_progress():
+    st.markdown(_progress_html(st.session_state.workflow_state["step"]), unsafe_allow_html=True)
+
+
+@st.cache_data(show_spinner=False)
+def _approval_chips_html(compliance_approved: bool, handoff_approved: bool) -> str:
+    approved = "<span class='chip-ok'>{} Approved</span>"
+    pending = "<span class='chip-pending'>{} Pending</span>"
+    return " ".join(
+        (approved if done else pending).format(label)
+        for label, done in (("Compliance", compliance_approved), ("Handoff", handoff_approved))
+    )
+
+
+@st.fragment(run_every=0.5)
+def render_generation_stages():
+    # Advances one stage per timer tick instead of sleeping in the script thread;
+    # once all stages are shown, a full rerun swaps in the generated state.
+    idx = st.session_state.get("prod_stage_idx", 0)
+    if idx >= len(PRODUCTION_STAGES):
+        st.session_state["prod_generating"] = False
+        st.session_state["prod_generated"] = True
+        st.session_state["prod_generate_elapsed"] = 0.0
+        st.session_state.workflow_state["step"] = 3
+        st.rerun()
+    chips = []
+    for j, (name, _) in enumerate(PRODUCTION_STAGES):
+        cls = "stage"
+        if j < idx:
+            cls += " done"
+        elif j == idx:
+            cls += " active"
+        chips.append(f"<span class='{cls}'>{html.escape(name)}</span>")
+    st.markdown(
+        "<div class='stages'>" + "".join(chips) + "</div>"
+        "<div class='shimmer'></div>"
+        f"<div class='stage-msg'>{html.escape(PRODUCTION_STAGES[idx][1])}</div>",
+        unsafe_allow_html=True,
+    )
+    st.session_state["prod_stage_idx"] = idx + 1
+
+
+@st.fragment
 def render_approval_section(agent_name: str, step_num: int):
+    # Runs as a fragment so requesting changes only reruns this panel, and the form
+    # holds feedback edits until a button is pressed; an approval advances the
+    # workflow and triggers a full app rerun.
     st.markdown(f"### 👤 {agent_name} Approval")
-    col1, col2 = st.columns([2, 1])
-    with col1:
-        feedback = st.text_area(
-            "Approval Feedback (optional)",
-            placeholder="Leave comments for the creative team...",
-            height=80,
-            key=f"feedback_{agent_name}",
-        )
-    with col2:
-        st.write("")
-        st.write("")
-        approve_clicked = st.button("✅ Approve", key=f"approve_{agent_name}", use_container_width=True)
-        reject_clicked = st.button("❌ Request Changes", key=f"reject_{agent_name}", use_container_width=True)
+    with st.form(key=f"approval_form_{agent_name}", border=False):
+        col1, col2 = st.columns([2, 1])
+        with col1:
+            feedback = st.text_area(
+                "Approval Feedback (optional)",
+                placeholder="Leave comments for the creative team...",
+                height=80,
+                key=f"feedback_{agent_name}",
+            )
+        with col2:
+            st.write("")
+            st.write("")
+            approve_clicked = st.form_submit_button("✅ Approve", use_container_width=True)
+            reject_clicked = st.form_submit_button("❌ Request Changes", use_container_width=True)
     approval_key = f"{agent_name.lower()}_approved"
     if approve_clicked:
         st.session_state.workflow_state[approval_key] = True
         st.session_state.approval_feedback[agent_name] = feedback
         st.success(f"✅ {agent_name} step approved!")
         st.session_state.workflow_state["step"] = step_num
-        return True
+        st.rerun()
     if reject_clicked:
         st.error(f"Changes requested for {agent_name} step. Please revise and resubmit.")
-        return False
+        return
     if st.session_state.workflow_state.get(approval_key, False):
         st.info(f"{agent_name} already approved.")
-    return False
 
 
 def main():
@@ -184,13 +431,13 @@ def main():
 
     # Fetch available campaigns from provider
     try:
-        campaigns: List[Dict[str, Any]] = _provider.list_campaigns() or []
+        campaigns: List[Dict[str, Any]] = _cached_list_campaigns()
     except Exception:
         campaigns = []
 
     # ---------- Intro Section: choose campaign or show empty state ----------
     if not st.session_state.get("workflow_started", False):
-        if isinstance(_provider, PlaceholderDataSource):
+        if _is_placeholder():
             st.info("Preview mode: live data enabled when Databricks connectivity is configured.")
 
         # Handle empty dataset gracefully
@@ -198,88 +445,56 @@ def main():
             tbl = get_creative_briefs_table()
             # Lightweight connectivity check to aid debugging
             try:
-                from utils import get_databricks_connection  # type: ignore
-                conn = get_databricks_connection()
-                if conn:
-                    try:
-                        cur = conn.cursor()
-                        cur.execute("SELECT 1")
-                        _ = cur.fetchone()
-                        # Try previewing first 5 rows from the configured table
-                        try:
-                            preview_sql = (
-                                f"SELECT brief_id, brief_title, lifecycle_stage, campaign_type, "
-                                f"medical_constraints, legal_requirements, created_at FROM {tbl} LIMIT 5"
+                from utils import uc_cursor  # type: ignore
+                preview = None
+                with uc_cursor() as cur:
+                    if cur is not None:
+                        # Preview first 5 rows; this query doubles as the connectivity check
+                        preview_sql = (
+                            f"SELECT brief_id, brief_title, lifecycle_stage, campaign_type, "
+                            f"medical_constraints, legal_requirements, created_at FROM {tbl} "
+                            f"WHERE brief_id IS NOT NULL LIMIT 5"
+                        )
+                        cur.execute(preview_sql)
+                        _rows = cur.fetchall() or []
+                        _cols = [d[0] for d in (cur.description or [])]
+                        preview = (preview_sql, _rows, _cols)
+                # Render after the cursor is returned so UI work never holds a pooled connection
+                if preview is not None:
+                    preview_sql, _rows, _cols = preview
+                    with st.expander(f"Sample query and first rows from {tbl}", expanded=False):
+                        st.code(preview_sql, language="sql")
+                        if _rows:
+                            import pandas as pd  # type: ignore
+                            st.dataframe(pd.DataFrame(_rows, columns=_cols), use_container_width=True, hide_index=True)
+                        else:
+                            st.caption("Table query returned 0 rows.")
+                    # Fallback: map preview rows into campaigns to unblock UI
+                    if _rows and _cols:
+                        preview_campaigns: List[Dict[str, Any]] = []
+                        for tup in _rows:
+                            row_dict = dict(zip(_cols, tup))
+                            if not row_dict:
+                                continue
+                            bid = row_dict.get("brief_id")
+                            if bid in (None, "", "null"):
+                                continue
+                            title = row_dict.get("brief_title") or str(bid)
+                            ctype = row_dict.get("campaign_type") or "Awareness"
+                            lifecycle = row_dict.get("lifecycle_stage")
+                            preview_campaigns.append(
+                                {
+                                    "brief_id": str(bid),
+                                    "brief_title": str(title),
+                                    "campaign_name": str(title),
+                                    "type": str(ctype),
+                                    "lifecycle_stage": lifecycle,
+                                    "medical_constraints": _to_list(row_dict.get("medical_constraints")),
+                                    "legal_requirements": _to_list(row_dict.get("legal_requirements")),
+                                }
                             )
-                            cur.execute(preview_sql)
-                            _rows = cur.fetchall() or []
-                            _cols = [d[0] for d in (cur.description or [])]
-                            with st.expander(f"Sample query and first rows from {tbl}", expanded=False):
-                                st.code(preview_sql, language="sql")
-                                if _rows:
-                                    import pandas as pd  # type: ignore
-                                    st.dataframe(pd.DataFrame(_rows, columns=_cols), use_container_width=True, hide_index=True)
-                                else:
-                                    st.caption("Table query returned 0 rows.")
-                            # Fallback: map preview rows into campaigns to unblock UI
-                            if _rows and _cols:
-                                preview_campaigns: List[Dict[str, Any]] = []
-                                for tup in _rows:
-                                    try:
-                                        row_dict = { _cols[i]: tup[i] for i in range(len(_cols)) }
-                                    except Exception:
-                                        row_dict = {}
-                                    if not row_dict:
-                                        continue
-                                    bid = row_dict.get("brief_id")
-                                    if bid in (None, "", "null"):
-                                        continue
-                                    title = row_dict.get("brief_title") or str(bid)
-                                    ctype = row_dict.get("campaign_type") or "Awareness"
-                                    lifecycle = row_dict.get("lifecycle_stage")
-                                    def _to_list(v):
-                                        if v is None:
-                                            return []
-                                        if isinstance(v, list):
-                                            return [str(x) for x in v]
-                                        s = str(v).strip()
-                                        if s.startswith("["):
-                                            import json as _json
-                                            try:
-                                                parsed = _json.loads(s)
-                                                if isinstance(parsed, list):
-                                                    return [str(x) for x in parsed]
-                                            except Exception:
-                                                pass
-                                        if "," in s:
-                                            return [p.strip() for p in s.split(",") if p.strip()]
-                                        return [s] if s else []
-                                    preview_campaigns.append(
-                                        {
-                                            "brief_id": str(bid),
-                                            "brief_title": str(title),
-                                            "campaign_name": str(title),
-                                            "type": str(ctype),
-                                            "lifecycle_stage": lifecycle,
-                                            "medical_constraints": _to_list(row_dict.get("medical_constraints")),
-                                            "legal_requirements": _to_list(row_dict.get("legal_requirements")),
-                                        }
-                                    )
-                                if preview_campaigns:
-                                    campaigns = preview_campaigns
-                        except Exception as e:
-                            pass
-                    except Exception as e:
-                        pass
-                    finally:
-                        try:
-                            cur.close()
-                        except Exception:
-                            pass
-                        try:
-                            conn.close()
-                        except Exception:
-                            pass
+                        if preview_campaigns:
+                            campaigns = preview_campaigns
             except Exception:
                 pass
             if not campaigns:
@@ -291,12 +506,14 @@ def main():
             name = str(item.get("campaign_name") or item.get("brief_title") or key)
             return f"{key} — {name}"
 
+        # Build labels once; format_func becomes a plain list index per option
+        campaign_labels = [_format_campaign_top(c) for c in campaigns]
         sel_idx = 0
         sel_item = st.selectbox(
             "Choose a campaign",
-            options=list(range(len(campaigns))),
+            options=range(len(campaigns)),
             index=sel_idx,
-            format_func=lambda i: _format_campaign_top(campaigns[i]),
+            format_func=campaign_labels.__getitem__,
             key="selected_campaign_index",
         )
         chosen = campaigns[sel_item]
@@ -319,40 +536,15 @@ def main():
         )
 
         # Summary card (same structure)
-        meta = st.session_state.get("campaign_meta", {}) or {}
-        lifecycle = meta.get("lifecycle_stage") or "-"
-        med_list = meta.get("medical_constraints")
-        legal_list = meta.get("legal_requirements")
-        med_cons = ", ".join(med_list) if isinstance(med_list, list) else str(med_list or "-")
-        legal_reqs = ", ".join(legal_list) if isinstance(legal_list, list) else str(legal_list or "-")
-        st.markdown('<div class="card">', unsafe_allow_html=True)
-        st.markdown("##### Campaign Summary")
-        st.markdown(
-            "<div class='brief-grid' style='margin-top:8px;'>"
-            f"<div class='brief-item'><div class='brief-item-label'>Title</div><div class='brief-item-value'>{html.escape(meta.get('brief_title','-') or '-')}</div></div>"
-            f"<div class='brief-item'><div class='brief-item-label'>Campaign</div><div class='brief-item-value'>{html.escape(meta.get('campaign_name','-') or '-')}</div></div>"
-            f"<div class='brief-item'><div class='brief-item-label'>Type</div><div class='brief-item-value'>{html.escape(st.session_state.campaign_brief.get('type','-') or '-')}</div></div>"
-            f"<div class='brief-item'><div class='brief-item-label'>Lifecycle</div><div class='brief-item-value'>{html.escape(str(lifecycle))}</div></div>"
-            f"<div class='brief-item'><div class='brief-item-label'>Medical Constraints</div><div class='brief-item-value'>{html.escape(med_cons)}</div></div>"
-            f"<div class='brief-item'><div class='brief-item-label'>Legal Requirements</div><div class='brief-item-value'>{html.escape(legal_reqs)}</div></div>"
-            "</div>",
-            unsafe_allow_html=True,
+        render_campaign_summary(
+            st.session_state.get("campaign_meta", {}) or {},
+            st.session_state.campaign_brief.get("type"),
         )
-        st.markdown("</div>", unsafe_allow_html=True)
         st.divider()
         if st.button("🚀 Start Campaign Creation", use_container_width=True):
             st.session_state.campaign_id = chosen.get("brief_id")
             st.session_state["prod_generated"] = False
-            st.session_state.workflow_state = {
-                "step": 0,
-                "agent": "idle",
-                "briefing_approved": False,
-                "production_approved": False,
-                "compliance_approved": False,
-                "handoff_approved": False,
-                "analysis_complete": False,
-                "messages": [],
-            }
+            st.session_state.workflow_state = _initial_workflow_state()
             st.session_state.approval_feedback = {}
             st.session_state["workflow_started"] = True
             st.rerun()
@@ -364,47 +556,37 @@ def main():
     st.markdown("#### Overall Progress")
     st.progress(pct)
     st.markdown("#### Approvals")
-    chips = []
-    chips.append(
-        ("<span style='background:#e8f5e9;color:#2e7d32;padding:4px 10px;border-radius:999px;border:1px solid #c8e6c9'>Compliance Approved</span>")
-        if st.session_state.workflow_state.get("compliance_approved")
-        else "<span style='background:#fff3e0;color:#e65100;padding:4px 10px;border-radius:999px;border:1px solid #ffe0b2'>Compliance Pending</span>"
-    )
-    chips.append(
-        ("<span style='background:#e8f5e9;color:#2e7d32;padding:4px 10px;border-radius:999px;border:1px solid #c8e6c9'>Handoff Approved</span>")
-        if st.session_state.workflow_state.get("handoff_approved")
-        else "<span style='background:#fff3e0;color:#e65100;padding:4px 10px;border-radius:999px;border:1px solid #ffe0b2'>Handoff Pending</span>"
+    st.markdown(
+        _approval_chips_html(
+            bool(st.session_state.workflow_state.get("compliance_approved")),
+            bool(st.session_state.workflow_state.get("handoff_approved")),
+        ),
+        unsafe_allow_html=True,
     )
-    st.markdown(" ".join(chips), unsafe_allow_html=True)
     brief = st.session_state.campaign_brief
     meta = st.session_state.get("campaign_meta", {})
 
-    tabs = st.tabs(["📝 Briefing", "🎨 Production", "✅ Compliance", "🚀 Handoff", "📊 Analysis"])
+    # st.tabs executes every tab body on each rerun (including the UC fetches behind
+    # Compliance/Handoff/Analysis); a radio selector renders only the active step.
+    active_tab = st.radio(
+        "Workflow step",
+        WORKFLOW_TABS,
+        horizontal=True,
+        label_visibility="collapsed",
+        key="active_tab",
+    )
 
     # ----- BRIEFING -----
-    with tabs[0]:
+    if active_tab == WORKFLOW_TABS[0]:
         st.subheader("📝 Briefing")
         if not st.session_state.get("campaign_meta", {}).get("brief_id"):
             st.info("No campaign selected.")
         else:
-            st.markdown('<div class="card">', unsafe_allow_html=True)
-            st.markdown("##### Campaign Summary")
-            st.markdown(
-                "<div class='brief-grid' style='margin-top:8px;'>"
-                f"<div class='brief-item'><div class='brief-item-label'>Title</div><div class='brief-item-value'>{html.escape(meta.get('brief_title','-') or '-')}</div></div>"
-                f"<div class='brief-item'><div class='brief-item-label'>Campaign</div><div class='brief-item-value'>{html.escape(meta.get('campaign_name','-') or '-')}</div></div>"
-                f"<div class='brief-item'><div class='brief-item-label'>Type</div><div class='brief-item-value'>{html.escape(brief.get('type','-') or '-')}</div></div>"
-                f"<div class='brief-item'><div class='brief-item-label'>Lifecycle</div><div class='brief-item-value'>{html.escape(str(meta.get('lifecycle_stage','-')))}</div></div>"
-                f"<div class='brief-item'><div class='brief-item-label'>Medical Constraints</div><div class='brief-item-value'>{html.escape(', '.join(meta.get('medical_constraints') or []) if isinstance(meta.get('medical_constraints'), list) else str(meta.get('medical_constraints') or '-'))}</div></div>"
-                f"<div class='brief-item'><div class='brief-item-label'>Legal Requirements</div><div class='brief-item-value'>{html.escape(', '.join(meta.get('legal_requirements') or []) if isinstance(meta.get('legal_requirements'), list) else str(meta.get('legal_requirements') or '-'))}</div></div>"
-                "</div>",
-                unsafe_allow_html=True,
-            )
-            st.markdown("</div>", unsafe_allow_html=True)
-            st.info("Next: open the “🎨 Production” tab to generate variations.")
+            render_campaign_summary(meta, brief.get("type"))
+            st.info("Next: switch to the “🎨 Production” step to generate variations.")
 
     # ----- PRODUCTION -----
-    with tabs[1]:
+    if active_tab == WORKFLOW_TABS[1]:
         st.subheader("🎨 Production Agent - Text-to-Image")
         col_seed, col_gen = st.columns([3, 2])
         with col_seed:
@@ -448,37 +630,9 @@ def main():
                     if st.button(btn_label, key="run_production_generate", use_container_width=True, disabled=btn_disabled):
                         st.session_state["prod_generating"] = True
                         st.session_state["prod_generate_started_at"] = time.time()
+                        st.session_state["prod_stage_idx"] = 0
                     if st.session_state.get("prod_generating"):
-                        stages = [
-                            ("Analyzing", "Analyzing prompt and context..."),
-                            ("Applying Guidelines", "Applying brand and compliance guidelines..."),
-                            ("Generating", "Generating creative with model..."),
-                            ("Optimizing", "Optimizing colors, layout, and composition..."),
-                            ("Finalizing", "Finalizing output and preparing preview..."),
-                        ]
-                        st.markdown("<div class='stages'>" + "".join([f"<span class='stage'>{html.escape(n)}</span>" for n, _ in stages]) + "</div>", unsafe_allow_html=True)
-                        stage_container = st.empty()
-                        shimmer_container = st.empty()
-                        for idx, (name, msg) in enumerate(stages):
-                            chips = []
-                            for j, (n2, _) in enumerate(stages):
-                                cls = "stage"
-                                if j < idx:
-                                    cls += " done"
-                                elif j == idx:
-                                    cls += " active"
-                                chips.append(f"<span class='{cls}'>{html.escape(n2)}</span>")
-                            stage_container.markdown("<div class='stages'>" + "".join(chips) + "</div>", unsafe_allow_html=True)
-                            shimmer_container.markdown("<div class='shimmer'></div>", unsafe_allow_html=True)
-                            st.markdown(f"<div style='font-size:14px;color:#555;margin:6px 0'>{html.escape(msg)}</div>", unsafe_allow_html=True)
-                            time.sleep(0.5)
-                        shimmer_container.empty()
-                        st.session_state["prod_generating"] = False
-                        st.session_state["prod_generated"] = True
-                        st.session_state["prod_generate_elapsed"] = 0.0
-                        st.markdown("<span class='success-badge'>✅ Generated</span>", unsafe_allow_html=True)
-                        st.session_state.workflow_state["step"] = 3
-                        st.rerun()
+                        render_generation_stages()
             else:
                 st.markdown("<div class='section-label'>Generated Creative</div>", unsafe_allow_html=True)
                 st.markdown('<div class="img-card">', unsafe_allow_html=True)
@@ -488,7 +642,7 @@ def main():
             st.info("Proceed to Compliance for approval.")
 
     # ----- COMPLIANCE -----
-    with tabs[2]:
+    if active_tab == WORKFLOW_TABS[2]:
         st.subheader("✅ Compliance Review")
         brief_id = st.session_state.get("campaign_meta", {}).get("brief_id")
         if not brief_id:
@@ -503,6 +657,9 @@ def main():
                 "- Content (10%): Inclusive representation, accuracy"
             )
             with st.spinner("🔎 Fetching compliance decision..."):
+                # The creative lookup is independent of the decision; overlap the two. A cache hit
+                # returns from the worker at once, and a cold fetch stays bounded by the result timeout.
+                img_future = _fetch_executor().submit(get_generated_image_bytes_from_uc, brief_id)
                 compliance = get_compliance_from_uc_timeout(brief_id, timeout=8)
             if not compliance:
                 st.warning(f"❌ No compliance record for {brief_id}")
@@ -510,34 +667,37 @@ def main():
                 col_img, col_det = st.columns([1, 1])
                 with col_img:
                     st.markdown("##### Generated Creative")
-                    img_b64 = get_generated_image_b64_from_uc(brief_id)
-                    if img_b64:
-                        try:
-                            img = Image.open(BytesIO(base64.b64decode(img_b64)))
-                            st.image(img, use_column_width=True)
-                        except Exception as e:
-                            st.warning(f"Could not display image: {e}")
-                    else:
-                        st.info("No generated image found for this brief.")
+                    try:
+                        img_bytes = img_future.result(timeout=8)
+                        if img_bytes:
+                            st.image(img_bytes, use_column_width=True)
+                        else:
+                            st.info("No generated image found for this brief.")
+                    except UCConnectionError as e:
+                        # Raised on the fetch worker, where st.error would be dropped; shown here instead
+                        st.error(str(e))
+                    except Exception as e:
+                        st.warning(f"Could not display image: {e}")
                 with col_det:
                     st.markdown("##### Compliance Overview")
                     st.info("Compliance scoring visualization will render when data is available from the provider.")
                 checklist = generate_approval_checklist_from_compliance(compliance)
                 st.markdown("###### Approval Checklist")
                 if checklist.get("total_items", 0) > 0:
-                    df_chk = pd.DataFrame([{"Assignee": it.get("assignee"), "Due Date": it.get("due_date")} for it in checklist.get("items", [])])
-                    st.table(df_chk)
+                    st.markdown(
+                        _mini_table_html(
+                            ["Assignee", "Due Date"],
+                            [(it.get("assignee"), it.get("due_date")) for it in checklist.get("items", [])],
+                        ),
+                        unsafe_allow_html=True,
+                    )
 
-            approved = render_approval_section("Compliance", 4)
-            if approved:
-                st.session_state.workflow_state["compliance_approved"] = True
-                st.session_state.workflow_state["step"] = 4
-                st.rerun()
+            render_approval_section("Compliance", 4)
 
     # ----- HANDOFF -----
-    with tabs[3]:
+    if active_tab == WORKFLOW_TABS[3]:
         st.subheader("🚀 Handoff & Go-Live")
-        if isinstance(_provider, PlaceholderDataSource):
+        if _is_placeholder():
             st.info(
                 "Preview mode: Handoff data requires Unity Catalog tables/views. "
                 "Create the relevant datasets and implement the Databricks data source to enable live handoff readiness."
@@ -546,174 +706,121 @@ def main():
             st.warning("⚠️ Please get Compliance approval first before handoff.")
         else:
             brief_id = st.session_state.get("campaign_meta", {}).get("brief_id") or ""
-            handoff_output = get_handoff_output({"brief_id": brief_id})
-            data = handoff_output.get("output", {})
+            data = _handoff_view(brief_id)
             status = str(data.get("readiness_status", "PENDING")).upper()
             ts = data.get("go_live_timestamp", "-")
-            channels = data.get("channels", []) or []
             budget = data.get("budget_allocation", {}) or {}
-            monitors = data.get("monitoring_metrics", []) or []
-            assignees = data.get("assignees", {}) or {}
-            color = "#2e7d32" if status == "GO_LIVE" else ("#f9a825" if status == "PENDING" else "#d32f2f")
+            pill = "go" if status == "GO_LIVE" else ("pending" if status == "PENDING" else "blocked")
             status_text = "✅ Ready to Launch" if status == "GO_LIVE" else ("⏳ Pending Launch" if status == "PENDING" else "🚫 Blocked")
             st.markdown(
-                "<div style='display:inline-block;padding:6px 12px;border-radius:999px;"
-                f"background:{color};color:#fff;font-weight:700;font-size:14px;'>"
-                f"{status_text}</div>",
+                f"<div class='status-pill status-pill-{pill}'>{status_text}</div>"
+                f"<p class='launch-line'><strong>Target Launch:</strong> {html.escape(str(ts))}</p>",
                 unsafe_allow_html=True,
             )
-            st.markdown(f"**Target Launch:** {ts}", unsafe_allow_html=True)
             st.divider()
             col_channels, col_budget, col_team = st.columns([1.2, 1, 1.3])
             with col_channels:
                 st.markdown("#### 📱 Channels")
-                if channels:
-                    chip_html = " ".join(
-                        f"<span style='display:inline-block;padding:5px 12px;border-radius:20px;background:#e3f2fd;color:#1565c0;margin:3px 6px 3px 0;border:1px solid #90caf9;font-weight:600;font-size:13px'>{html.escape(c)}</span>"
-                        for c in channels
-                    )
-                    st.markdown(chip_html, unsafe_allow_html=True)
+                if data["channels_html"]:
+                    st.markdown(data["channels_html"], unsafe_allow_html=True)
                 else:
                     st.write("—")
                 st.markdown("#### 📊 Monitoring Metrics", unsafe_allow_html=True)
-                if monitors:
-                    metrics_html = "<ul style='margin:8px 0;padding-left:20px;'>"
-                    for m in monitors:
-                        metrics_html += f"<li style='margin:6px 0;color:#424242;font-size:13px'>{html.escape(str(m))}</li>"
-                    metrics_html += "</ul>"
-                    st.markdown(metrics_html, unsafe_allow_html=True)
+                if data["monitors_html"]:
+                    st.markdown(data["monitors_html"], unsafe_allow_html=True)
                 else:
                     st.write("—")
             with col_budget:
                 st.markdown("#### 💰 Budget Split")
                 if budget:
-                    budget_data = [{"Channel": k.title(), "Allocation": v} for k, v in budget.items()]
-                    df_budget = pd.DataFrame(budget_data)
-                    st.dataframe(
-                        df_budget,
-                        use_container_width=True,
-                        hide_index=True,
-                        column_config={"Channel": st.column_config.TextColumn(width="medium"), "Allocation": st.column_config.TextColumn(width="small")},
+                    st.markdown(
+                        _mini_table_html(["Channel", "Allocation"], [(k.title(), v) for k, v in budget.items()]),
+                        unsafe_allow_html=True,
                     )
-                    st.markdown("**Allocation Breakdown**")
+                    bars = []
                     for ch, pct in budget.items():
                         pct_num = float(pct.rstrip("%")) if isinstance(pct, str) else 0
-                        st.progress(pct_num / 100, text=f"{ch.title()}: {pct}")
+                        bars.append(
+                            f"<div class='alloc-label'>{html.escape(ch.title())}: {html.escape(str(pct))}</div>"
+                            f"<div class='alloc-bar'><div class='alloc-fill' style='width:{max(0.0, min(pct_num, 100.0)):g}%'></div></div>"
+                        )
+                    st.markdown("<strong>Allocation Breakdown</strong>" + "".join(bars), unsafe_allow_html=True)
                 else:
                     st.write("—")
             with col_team:
                 st.markdown("#### 👥 Channel Owners")
-                if assignees:
-                    for channel, owner in assignees.items():
-                        owner_name = str(owner).split("(")[0].strip() if "(" in str(owner) else str(owner)
-                        owner_role = str(owner).split("(")[1].rstrip(")") if "(" in str(owner) else ""
-                        owner_html = (
-                            f"<div style='padding:8px 10px;margin:6px 0;border-radius:8px;"
-                            f"background:#f5f5f5;border-left:4px solid #f15a6b;'>"
-                            f"<div style='font-weight:600;color:#1a1a1a;font-size:13px'>{html.escape(channel)}</div>"
-                            f"<div style='font-size:12px;color:#666;margin-top:3px'>{html.escape(owner_name)}</div>"
-                            f"<div style='font-size:11px;color:#999;margin-top:2px'>{html.escape(owner_role)}</div>"
-                            f"</div>"
-                        )
-                        st.markdown(owner_html, unsafe_allow_html=True)
+                if data["owners_html"]:
+                    st.markdown(data["owners_html"], unsafe_allow_html=True)
                 else:
                     st.write("—")
                 st.divider()
             st.markdown("#### ✓ Pre-Launch Checklist")
-            checklist_items = [
-                ("Campaign assets approved & uploaded", False),
-                ("Tracking parameters configured", False),
-                ("Compliance notes shared with owners", False),
-                ("Team assignments confirmed", False),
-                ("Budget limits set in ad platforms", False),
-            ]
-            checklist_html = "<div style='background:#f9f9f9;padding:12px;border-radius:8px;border:1px solid #eee;'>"
-            for item, completed in checklist_items:
-                check_icon = "✅" if completed else "⏳"
-                check_color = "#2e7d32" if completed else "#ffa500"
-                checklist_html += (
-                    f"<div style='padding:6px 0;display:flex;align-items:center;color:#333;font-size:13px;'>"
-                    f"<span style='color:{check_color};margin-right:10px;font-weight:bold;'>{check_icon}</span>"
-                    f"{html.escape(item)}"
-                    f"</div>"
-                )
-            checklist_html += "</div>"
-            st.markdown(checklist_html, unsafe_allow_html=True)
+            st.markdown(PRELAUNCH_CHECKLIST_HTML, unsafe_allow_html=True)
             st.divider()
-            approved = render_approval_section("Handoff", 5)
-            if approved:
-                st.session_state.workflow_state["handoff_approved"] = True
-                st.session_state.workflow_state["step"] = 5
-                st.rerun()
+            render_approval_section("Handoff", 5)
 
     # ----- ANALYSIS -----
-    with tabs[4]:
+    if active_tab == WORKFLOW_TABS[4]:
         st.subheader("📊 Campaign Performance Analysis")
         brief_id = st.session_state.get("campaign_meta", {}).get("brief_id") or ""
-        analysis_output = get_analysis_output({"brief_id": brief_id})
+        analysis_output = _brief_bundle(brief_id).get("analysis") or {}
         out = analysis_output.get("output", {})
         metrics = out.get("performance_metrics", []) or []
-        findings = out.get("key_findings", []) or []
-        next_brief = out.get("next_iteration_brief", {}) or {}
+        # Exact type checks on purpose: provider payloads are plain JSON lists/dicts, and anything
+        # else (strings included) is treated as absent rather than rendered item by item
+        findings = out.get("key_findings")
+        findings = findings if type(findings) is list else ()
+        next_brief = out.get("next_iteration_brief")
+        next_brief = next_brief if type(next_brief) is dict else None
         if not metrics:
             st.info("📈 Performance analysis will be available after campaign launch.")
         else:
             st.markdown("#### 📈 Key Performance Indicators")
             try:
-                m1 = metrics[0]
-                m2 = metrics[1]
-                m3 = metrics[2]
-                col1, col2, col3 = st.columns(3)
-                for i, m in enumerate([m1, m2, m3], start=1):
-                    status_color = "#2e7d32" if "↑" in m.get("status", "") else "#d32f2f"
-                    with (col1 if i == 1 else col2 if i == 2 else col3):
-                        st.markdown(
-                            f"<div style='padding:16px;border-radius:12px;background:#fafafa;border:1px solid #eee;'>"
-                            f"<div style='font-size:12px;color:#666;font-weight:600;margin-bottom:8px'>{html.escape(m.get('metric', '-'))}</div>"
-                            f"<div style='font-size:32px;font-weight:700;color:#1a1a1a'>{m.get('value', 0):.2f}</div>"
-                            f"<div style='font-size:13px;color:{status_color};font-weight:600;margin-top:8px'>{html.escape(m.get('status', ''))}</div>"
-                            f"<div style='font-size:11px;color:#999;margin-top:6px;line-height:1.4'>{html.escape(m.get('context', ''))}</div>"
-                            f"</div>",
-                            unsafe_allow_html=True,
-                        )
+                kpi_cards = []
+                for m in metrics[:3]:
+                    trend = "kpi-up" if "↑" in m.get("status", "") else "kpi-down"
+                    kpi_cards.append(
+                        f"<div class='kpi-card'>"
+                        f"<div class='kpi-metric'>{html.escape(m.get('metric', '-'))}</div>"
+                        f"<div class='kpi-value'>{m.get('value', 0):.2f}</div>"
+                        f"<div class='kpi-status {trend}'>{html.escape(m.get('status', ''))}</div>"
+                        f"<div class='kpi-context'>{html.escape(m.get('context', ''))}</div>"
+                        f"</div>"
+                    )
+                st.markdown(
+                    f"<div class='kpi-grid'>{''.join(kpi_cards)}</div>",
+                    unsafe_allow_html=True,
+                )
             except Exception:
                 st.info("Metrics present but not in expected format.")
-            st.divider()
-            st.markdown("#### 🔍 Key Findings & Insights")
+            # Findings and the next-iteration heading go out as one element
             if findings:
-                findings_html = (
-                    "<div style='background:#f0f7ff;padding:16px;border-radius:12px;border-left:4px solid #1565c0;'>"
-                    "<ul style='margin:0;padding-left:20px;'>"
+                findings_html = "".join(
+                    ["<div class='findings'><ul>", *(FINDING_ITEM_HTML.format(html.escape(str(f))) for f in findings), "</ul></div>"]
                 )
-                for finding in findings:
-                    findings_html += f"<li style='margin:8px 0;color:#1a1a1a;font-size:13px;line-height:1.6'>{html.escape(str(finding))}</li>"
-                findings_html += "</ul></div>"
-                st.markdown(findings_html, unsafe_allow_html=True)
             else:
-                st.write("—")
-            st.divider()
-            st.markdown("#### 🚀 Next Iteration Recommendations")
-            if isinstance(next_brief, dict) and next_brief:
-                st.write(next_brief)
+                findings_html = "<p>—</p>"
+            st.markdown(
+                "<hr><h4>🔍 Key Findings &amp; Insights</h4>"
+                f"{findings_html}"
+                "<hr><h4>🚀 Next Iteration Recommendations</h4>",
+                unsafe_allow_html=True,
+            )
+            if next_brief:
+                # Collapsed JSON tree: a single element instead of st.write's generic dict rendering
+                st.json(next_brief, expanded=False)
             else:
                 st.write("—")
-            st.divider()
-            st.markdown("##### Performance Insight Dashboard")
-            st.caption("Overview of media spend and revenue across all active marketing campaigns")
-            dashboard_url = os.environ.get("DATABRICKS_DASHBOARD_URL", "")
-            if dashboard_url:
-                st.components.v1.html(
-                    f"""
-                    <iframe
-                        src="{dashboard_url}"
-                        width="100%"
-                        height="1500"
-                        frameborder="0">
-                    </iframe>
-                    """,
-                    height=1500,
-                    scrolling=True,
-                )
+            st.markdown(DASHBOARD_HEADER_HTML, unsafe_allow_html=True)
+            block = _dashboard_block()
+            if block is not None:
+                iframe_html, height = block
+                # Plain markdown iframe: no components wrapper iframe around the dashboard iframe
+                with st.container(height=height, border=False):
+                    st.markdown(iframe_html, unsafe_allow_html=True)
+            elif get_dashboard_url():
+                st.warning("DATABRICKS_DASHBOARD_URL must be an https Databricks workspace URL.")
             else:
                 st.info("Set environment variable DATABRICKS_DASHBOARD_URL to embed your Databricks dashboard here.")
 
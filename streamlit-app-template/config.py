@@ -1,25 +1,60 @@
 import os
+from dataclasses import dataclass
+from functools import lru_cache
+
 from datasource import DataSource, PlaceholderDataSource, DatabricksDataSource
 
 
+@dataclass(frozen=True)
+class _EnvConfig:
+    host: str
+    token: str
+    warehouse_id: str
+    http_path: str
+    catalog: str
+    schema: str
+    creative_briefs_table: str
+    generated_creatives_table: str
+    dashboard_url: str
+
+
+@lru_cache(maxsize=1)
+def _env() -> _EnvConfig:
+    """
+    Snapshot of the environment the app is configured from.
+    The process environment does not change between Streamlit reruns, so it is read once.
+    """
+    return _EnvConfig(
+        host=os.environ.get("DATABRICKS_HOST", "") or "",
+        token=os.environ.get("DATABRICKS_TOKEN", "") or "",
+        # Prefer DATABRICKS_WAREHOUSE_ID; fall back to SQL_WAREHOUSE_ID for compatibility
+        warehouse_id=os.environ.get("DATABRICKS_WAREHOUSE_ID", "") or os.environ.get("SQL_WAREHOUSE_ID", "") or "",
+        http_path=os.environ.get("DATABRICKS_HTTP_PATH", "") or "",
+        catalog=os.environ.get("DATABRICKS_CATALOG", "") or "",
+        schema=os.environ.get("DATABRICKS_SCHEMA", "") or "",
+        creative_briefs_table=os.environ.get("CREATIVE_BRIEFS_TABLE", "main.flo_martech.creative_briefs"),
+        generated_creatives_table=os.environ.get("GENERATED_CREATIVES_TABLE", "main.flo_martech.generated_creatives"),
+        dashboard_url=(os.environ.get("DATABRICKS_DASHBOARD_URL", "") or "").strip(),
+    )
+
+
+@lru_cache(maxsize=1)
 def get_data_source() -> DataSource:
     """
     Select a data source without requiring a DATA_PROVIDER toggle.
     - If Databricks environment variables are present, return DatabricksDataSource.
     - Otherwise, return PlaceholderDataSource (empty, safe defaults).
+    The instance is built once per process, so utils and app share one provider and one connection.
     """
-    host = os.environ.get("DATABRICKS_HOST", "") or ""
-    token = os.environ.get("DATABRICKS_TOKEN", "") or ""
-    # Prefer DATABRICKS_WAREHOUSE_ID; fall back to SQL_WAREHOUSE_ID for compatibility
-    warehouse_id = os.environ.get("DATABRICKS_WAREHOUSE_ID", "") or os.environ.get("SQL_WAREHOUSE_ID", "") or ""
-    if host and token:
+    env = _env()
+    if env.host and env.token:
         return DatabricksDataSource(
-            host=host,
-            token=token,
-            warehouse_id=warehouse_id,
-            http_path=os.environ.get("DATABRICKS_HTTP_PATH", "") or "",
-            catalog=os.environ.get("DATABRICKS_CATALOG", "") or "",
-            schema=os.environ.get("DATABRICKS_SCHEMA", "") or "",
+            host=env.host,
+            token=env.token,
+            warehouse_id=env.warehouse_id,
+            http_path=env.http_path,
+            catalog=env.catalog,
+            schema=env.schema,
         )
     return PlaceholderDataSource()
 
@@ -29,16 +64,17 @@ def get_creative_briefs_table() -> str:
     Returns the fully-qualified table name for creative briefs.
     Override with env var CREATIVE_BRIEFS_TABLE, defaults to main.flo_martech.creative_briefs.
     """
-    return os.environ.get("CREATIVE_BRIEFS_TABLE", "main.flo_martech.creative_briefs")
+    return _env().creative_briefs_table
 
 def get_generated_creatives_table() -> str:
     """
     Returns the fully-qualified table name for generated creatives.
     Override with env var GENERATED_CREATIVES_TABLE, defaults to main.flo_martech.generated_creatives.
     """
-    return os.environ.get("GENERATED_CREATIVES_TABLE", "main.flo_martech.generated_creatives")
-
-
-
-
+    return _env().generated_creatives_table
 
+def get_dashboard_url() -> str:
+    """
+    Returns the embed URL for the Analysis dashboard, or "" when DATABRICKS_DASHBOARD_URL is unset.
+    """
+    return _env().dashboard_url
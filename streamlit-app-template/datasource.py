@@ -1,12 +1,19 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Protocol, runtime_checkable
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, List, Mapping, Optional, Protocol, Sequence, Tuple, Union
 import json
+import threading
 import time
+from types import MappingProxyType
+
+try:
+    from orjson import loads as _json_loads  # type: ignore
+except ImportError:  # orjson is optional; stdlib json parses the same payloads
+    _json_loads = json.loads
 
 
-@runtime_checkable
 class DataSource(Protocol):
     def list_campaigns(self) -> List[Dict[str, Any]]:
         """
@@ -42,6 +49,198 @@ class DataSource(Protocol):
         """Return the analysis output structure. Should always return a dict."""
         ...
 
+    def get_brief_bundle(self, brief_id: str) -> Dict[str, Any]:
+        """
+        Return the Handoff and Analysis outputs for one brief in a single call:
+        {"handoff": dict, "analysis": dict}. Compliance is fetched on its own,
+        only by the Compliance step.
+        """
+        ...
+
+
+# Shared read-only "no data" result for the output-shaped lookups. Callers only read it.
+# Not used inside get_brief_bundle: that result goes through st.cache_data, which pickles
+# its values, and mappingproxy objects cannot be pickled.
+_EMPTY_OUTPUT: Mapping[str, Any] = MappingProxyType({"output": MappingProxyType({})})
+
+
+# Recent briefs; rows without a brief_id are dropped by the mapping below anyway,
+# so filter them out in the warehouse
+CAMPAIGNS_SQL = """
+    SELECT
+        brief_id,
+        brief_title,
+        target_segment,
+        lifecycle_stage,
+        campaign_type,
+        key_message,
+        brand_guidelines,
+        medical_constraints,
+        legal_requirements,
+        created_at,
+        created_by
+    FROM {table}
+    WHERE brief_id IS NOT NULL
+    ORDER BY created_at DESC
+    LIMIT 100
+"""
+
+
+@lru_cache(maxsize=1)
+def _load_sql_module() -> Any:
+    """
+    Import databricks-sql-connector on first use only. The placeholder path
+    never connects, so it never pays for the connector's import tree.
+    """
+    from databricks import sql  # type: ignore
+
+    return sql
+
+
+# Rows pulled per round-trip on the non-Arrow path
+FETCH_BATCH_ROWS = 10_000
+
+
+def _fetch_dicts(cursor: Any, max_rows: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Materialize the cursor's result set as a list of dicts, stopping after
+    max_rows when given.
+    Tries the connector's Arrow path first so rows are decoded column-wise
+    instead of as per-row tuples. Connectors without it, or installs without
+    pyarrow (optional from connector 4.x), pull rows in fetchmany batches so a
+    result without a LIMIT is never staged whole.
+    """
+    try:
+        if max_rows is not None:
+            return cursor.fetchmany_arrow(max_rows).to_pylist()
+        return cursor.fetchall_arrow().to_pylist()
+    except (ImportError, AttributeError):
+        pass
+    cols = [c[0] for c in (cursor.description or [])]
+    rows: List[Dict[str, Any]] = []
+    while max_rows is None or len(rows) < max_rows:
+        size = FETCH_BATCH_ROWS if max_rows is None else min(FETCH_BATCH_ROWS, max_rows - len(rows))
+        batch = cursor.fetchmany(size)
+        if not batch:
+            break
+        rows.extend(dict(zip(cols, r)) for r in batch)
+    return rows
+
+
+def _as_list(val: Any) -> List[str]:
+    # Exact-type fast path for the str/bytes cells drivers return; anything else takes the checks below
+    kind = type(val)
+    if kind is str or kind is bytes:
+        return list(_parse_list_cell(val))
+    if val is None:
+        return []
+    if isinstance(val, list):
+        # ARRAY<STRING> columns arrive as fresh lists of str; hand them through without copying
+        if all(type(x) is str for x in val):
+            return val
+        return [str(x) for x in val]
+    if isinstance(val, bytearray):
+        val = bytes(val)
+    elif not isinstance(val, bytes):
+        val = str(val)
+    return list(_parse_list_cell(val))
+
+
+@lru_cache(maxsize=1024)
+def _parse_list_cell(val: Union[str, bytes]) -> Tuple[str, ...]:
+    """
+    Parse one constraints/requirements cell. Briefs reuse the same guideline
+    text heavily, so each distinct cell value is parsed once per process.
+    """
+    if isinstance(val, bytes):
+        try:
+            s = val.decode("utf-8")
+        except Exception:
+            s = str(val)
+    else:
+        s = val
+    s_strip = s.strip()
+    # JSON array/object
+    if s_strip.startswith("[") or s_strip.startswith("{"):
+        try:
+            # Raw driver bytes go straight to the parser; both orjson and json accept them
+            parsed = _json_loads(val if isinstance(val, bytes) else s_strip)
+            if isinstance(parsed, list):
+                return tuple(str(x) for x in parsed)
+            # If object, return values
+            if isinstance(parsed, dict):
+                return tuple(str(v) for v in parsed.values())
+        except Exception:
+            pass
+    # Comma-separated
+    if "," in s:
+        return tuple(part.strip() for part in s.split(",") if part.strip())
+    # Single token
+    return (s_strip,) if s_strip else ()
+
+
+# Column aliases accepted for each campaign field, in priority order
+ID_ALIASES = ("brief_id", "id", "brief_key", "campaign_id")
+TITLE_ALIASES = ("brief_title", "title", "name", "campaign_name")
+NAME_ALIASES = ("campaign_name", "campaign_title", "name")
+TYPE_ALIASES = ("type", "campaign_type")
+LIFECYCLE_ALIASES = ("lifecycle_stage", "lifecycle")
+MEDICAL_ALIASES = ("medical_constraints", "medical_guidelines")
+LEGAL_ALIASES = ("legal_requirements", "legal_guidelines")
+
+
+def _first_value(r: Dict[str, Any], cols: Tuple[str, ...]) -> Any:
+    for c in cols:
+        v = r.get(c)
+        if v:
+            return v
+    return None
+
+
+def _campaigns_from_rows(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Map creative_briefs rows to the UI's campaign structure."""
+    if not rows:
+        return []
+    # Every row of a result set has the same columns: resolve which aliases exist once,
+    # so the per-row fallbacks only probe columns that are actually there
+    present = rows[0].keys()
+
+    def _cols(aliases: Tuple[str, ...]) -> Tuple[str, ...]:
+        return tuple(c for c in aliases if c in present)
+
+    id_cols, title_cols, name_cols = _cols(ID_ALIASES), _cols(TITLE_ALIASES), _cols(NAME_ALIASES)
+    type_cols, lifecycle_cols = _cols(TYPE_ALIASES), _cols(LIFECYCLE_ALIASES)
+    medical_cols, legal_cols = _cols(MEDICAL_ALIASES), _cols(LEGAL_ALIASES)
+
+    campaigns: List[Dict[str, Any]] = []
+    for r in rows:
+        brief_id = _first_value(r, id_cols)
+        if brief_id is None:
+            # Skip records without a stable identifier
+            continue
+        brief_title = _first_value(r, title_cols) or str(brief_id)
+        campaign_name = _first_value(r, name_cols) or brief_title
+        campaign_type = _first_value(r, type_cols) or "Awareness"
+        lifecycle_stage = _first_value(r, lifecycle_cols)
+
+        campaigns.append(
+            {
+                "brief_id": str(brief_id),
+                "brief_title": str(brief_title),
+                "campaign_name": str(campaign_name),
+                "type": str(campaign_type),
+                "lifecycle_stage": lifecycle_stage,
+                "medical_constraints": _as_list(_first_value(r, medical_cols)),
+                "legal_requirements": _as_list(_first_value(r, legal_cols)),
+                # Optional fields if present in table
+                "seed_image_path": r.get("seed_image_path"),
+                "generated_image_path": r.get("generated_image_path"),
+                "expert_prompt": r.get("expert_prompt"),
+            }
+        )
+
+    return campaigns
+
 
 class PlaceholderDataSource:
     """
@@ -57,158 +256,22 @@ class PlaceholderDataSource:
         """
         try:
             # Lazy import to avoid circulars and to leverage shared connector
-            from utils import get_databricks_connection  # type: ignore
+            from utils import uc_cursor  # type: ignore
             from config import get_creative_briefs_table  # type: ignore
         except Exception:
             return []
 
-        rows: List[Dict[str, Any]] = []
-        conn = None
-        cursor = None
         try:
-            conn = get_databricks_connection()
-            if not conn:
-                return []
-            cursor = conn.cursor()
-            # Keep query conservative: fetch recent briefs; adjust as needed
-            table_name = get_creative_briefs_table()
-            sql_text = (
-                """
-                SELECT
-                    brief_id,
-                    brief_title,
-                    target_segment,
-                    lifecycle_stage,
-                    campaign_type,
-                    key_message,
-                    brand_guidelines,
-                    medical_constraints,
-                    legal_requirements,
-                    created_at,
-                    created_by
-                FROM {table}
-                ORDER BY created_at DESC
-                LIMIT 100
-                """.format(table=table_name)
-            )
-            cursor.execute(sql_text)
-            desc = [c[0] for c in (cursor.description or [])]
-            while True:
-                rec = cursor.fetchone()
-                if not rec:
-                    break
-                as_dict = {desc[i]: rec[i] for i in range(len(desc))}
-                rows.append(as_dict)
-            # Fallback: if fetchone loop yielded no rows, try fetchall once
-            if not rows:
-                try:
-                    cursor.execute(sql_text)
-                    all_rows = cursor.fetchall() or []
-                    desc = [c[0] for c in (cursor.description or [])]
-                    for rec in all_rows:
-                        try:
-                            as_dict = {desc[i]: rec[i] for i in range(len(desc))}
-                            rows.append(as_dict)
-                        except Exception:
-                            continue
-                except Exception:
-                    pass
+            with uc_cursor() as cursor:
+                if cursor is None:
+                    return []
+                # Keep query conservative: fetch recent briefs; adjust CAMPAIGNS_SQL as needed
+                cursor.execute(CAMPAIGNS_SQL.format(table=get_creative_briefs_table()))
+                rows = _fetch_dicts(cursor)
         except Exception:
             return []
-        finally:
-            try:
-                if cursor:
-                    cursor.close()
-            except Exception:
-                pass
-            try:
-                if conn:
-                    conn.close()
-            except Exception:
-                pass
-
-        def _as_list(val: Any) -> List[str]:
-            if val is None:
-                return []
-            if isinstance(val, list):
-                return [str(x) for x in val]
-            if isinstance(val, (bytes, bytearray)):
-                try:
-                    s = val.decode("utf-8")
-                except Exception:
-                    s = str(val)
-            else:
-                s = str(val)
-            s_strip = s.strip()
-            # JSON array/object
-            if s_strip.startswith("[") or s_strip.startswith("{"):
-                try:
-                    parsed = json.loads(s_strip)
-                    if isinstance(parsed, list):
-                        return [str(x) for x in parsed]
-                    # If object, return values
-                    if isinstance(parsed, dict):
-                        return [str(v) for v in parsed.values()]
-                except Exception:
-                    pass
-            # Comma-separated
-            if "," in s:
-                return [part.strip() for part in s.split(",") if part.strip()]
-            # Single token
-            return [s_strip] if s_strip else []
-
-        campaigns: List[Dict[str, Any]] = []
-        for r in rows:
-            # Flexible mapping to accommodate different column naming conventions
-            brief_id = (
-                r.get("brief_id")
-                or r.get("id")
-                or r.get("brief_key")
-                or r.get("campaign_id")
-            )
-            if brief_id is None:
-                # Skip records without a stable identifier
-                continue
-            brief_title = (
-                r.get("brief_title")
-                or r.get("title")
-                or r.get("name")
-                or r.get("campaign_name")
-                or str(brief_id)
-            )
-            campaign_name = (
-                r.get("campaign_name")
-                or r.get("campaign_title")
-                or r.get("name")
-                or brief_title
-            )
-            campaign_type = r.get("type") or r.get("campaign_type") or "Awareness"
-            lifecycle_stage = r.get("lifecycle_stage") or r.get("lifecycle") or None
-
-            medical_constraints = _as_list(
-                r.get("medical_constraints") or r.get("medical_guidelines")
-            )
-            legal_requirements = _as_list(
-                r.get("legal_requirements") or r.get("legal_guidelines")
-            )
-
-            campaigns.append(
-                {
-                    "brief_id": str(brief_id),
-                    "brief_title": str(brief_title),
-                    "campaign_name": str(campaign_name),
-                    "type": str(campaign_type),
-                    "lifecycle_stage": lifecycle_stage,
-                    "medical_constraints": medical_constraints,
-                    "legal_requirements": legal_requirements,
-                    # Optional fields if present in table
-                    "seed_image_path": r.get("seed_image_path"),
-                    "generated_image_path": r.get("generated_image_path"),
-                    "expert_prompt": r.get("expert_prompt"),
-                }
-            )
-
-        return campaigns
+
+        return _campaigns_from_rows(rows)
 
     def get_compliance(self, brief_id: str) -> Optional[Dict[str, Any]]:
         return None
@@ -218,11 +281,14 @@ class PlaceholderDataSource:
 
     def get_handoff_output(self, params: Dict[str, Any]) -> Dict[str, Any]:
         # Keep the expected output contract but empty
-        return {"output": {}}
+        return _EMPTY_OUTPUT
 
     def get_analysis_output(self, params: Dict[str, Any]) -> Dict[str, Any]:
         # Keep the expected output contract but empty
-        return {"output": {}}
+        return _EMPTY_OUTPUT
+
+    def get_brief_bundle(self, brief_id: str) -> Dict[str, Any]:
+        return {"handoff": {"output": {}}, "analysis": {"output": {}}}
 
 
 @dataclass
@@ -240,28 +306,67 @@ class DatabricksDataSource:
     catalog: str = ""
     schema: str = ""
 
-    # Example: lazy connection handle (not initialized here)
+    # Lazily opened connection, reused by every query on this instance
     _conn: Any = None
+    # The connector's connections are not thread-safe; serialize access to _conn
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
 
     def _ensure_conn(self) -> None:
         """
-        Establish and cache a connection. Not implemented by default.
+        Establish and cache a connection. Callers must hold self._lock.
         """
-        raise NotImplementedError(
-            "Implement Databricks connection setup in DatabricksDataSource._ensure_conn"
+        if self._conn is not None:
+            return
+        sql = _load_sql_module()
+        http_path = self.http_path or (f"/sql/1.0/warehouses/{self.warehouse_id}" if self.warehouse_id else "")
+        if not http_path:
+            raise RuntimeError("Set DATABRICKS_HTTP_PATH or DATABRICKS_WAREHOUSE_ID to query Databricks.")
+        self._conn = sql.connect(
+            server_hostname=self.host.replace("https://", "").rstrip("/"),
+            http_path=http_path,
+            access_token=self.token,
+            catalog=self.catalog or None,
+            schema=self.schema or None,
         )
 
+    def _reset_conn(self) -> None:
+        try:
+            if self._conn is not None:
+                self._conn.close()
+        except Exception:
+            pass
+        self._conn = None
+
+    def _execute_sql(
+        self, sql_text: str, params: Optional[Sequence[Any]] = None, max_rows: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Run a query on the shared connection and return rows as dicts.
+        max_rows caps how many rows are pulled, e.g. for first-page UI tables.
+        A failed query drops the connection so the next call reconnects.
+        """
+        with self._lock:
+            self._ensure_conn()
+            try:
+                with self._conn.cursor() as cur:
+                    cur.execute(sql_text, params)
+                    return _fetch_dicts(cur, max_rows)
+            except Exception:
+                self._reset_conn()
+                raise
+
     def list_campaigns(self) -> List[Dict[str, Any]]:
         """
-        Reuse the placeholder implementation which already queries
-        main.flo_martech.creative_briefs via shared utils connection and
-        maps rows to the UI's expected structure.
+        Query the creative briefs table on the shared connection and map
+        rows to the UI's expected structure.
         """
         try:
-            provider = PlaceholderDataSource()
-            return provider.list_campaigns()
+            from config import get_creative_briefs_table  # type: ignore
+
+            rows = self._execute_sql(CAMPAIGNS_SQL.format(table=get_creative_briefs_table()))
         except Exception:
             return []
+        return _campaigns_from_rows(rows)
 
     def get_compliance(self, brief_id: str) -> Optional[Dict[str, Any]]:
         raise NotImplementedError(
@@ -282,4 +387,12 @@ class DatabricksDataSource:
         raise NotImplementedError(
             "Implement a query to fetch analysis outputs / metrics for the campaign."
         )
+
+    def get_brief_bundle(self, brief_id: str) -> Dict[str, Any]:
+        # Composed from the per-output queries; replace with one query when both live in one table
+        params = {"brief_id": brief_id}
+        return {
+            "handoff": self.get_handoff_output(params),
+            "analysis": self.get_analysis_output(params),
+        }
  
@@ -1,279 +1,306 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
-import time
+import atexit
+import base64
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Dict, Mapping, Optional, Tuple
 
-from config import get_data_source
+import streamlit as st  # type: ignore
+from config import get_data_source, get_generated_creatives_table  # type: ignore
+from datasource import _EMPTY_OUTPUT  # type: ignore
 
-_provider = get_data_source()
+BRIEF_FIELDS = ("type", "audience", "budget", "timeline", "brief")
 
 
-def normalize_brief(brief: Dict[str, Any], defaults: Dict[str, Any]) -> Dict[str, Any]:
-    normalized = dict(defaults or {})
-    for k, v in (brief or {}).items():
-        normalized[k] = v
+def normalize_brief(brief: dict, defaults: dict) -> dict:
+    brief_get, default_get = brief.get, defaults.get
+    normalized = {k: brief_get(k) or default_get(k) for k in BRIEF_FIELDS}
+    # Budget falls back only on missing/empty/zero, not on any falsy value
+    budget = brief_get("budget")
+    normalized["budget"] = budget if budget not in (None, "", 0) else default_get("budget")
     return normalized
 
 
-def get_compliance_from_uc_timeout(brief_id: str, timeout: float = 8.0) -> Optional[Dict[str, Any]]:
+@st.cache_data(ttl=600, max_entries=256, show_spinner=False)
+def get_compliance_from_uc(brief_id: str) -> Dict[str, Any]:
     """
-    Delegates to provider.get_compliance. The timeout is advisory; this
-    implementation does not enforce a hard timeout and returns None on error.
+    Delegates to provider.get_compliance; empty when the provider has no record.
     """
     try:
-        started = time.time()
-        result = _provider.get_compliance(brief_id)
-        # Optional: respect advisory timeout by dropping late results
-        if (time.time() - started) > timeout:
-            return None
-        return result
+        return get_data_source().get_compliance(brief_id) or {}
     except Exception:
-        return None
+        return {}
+
+
+@st.cache_resource(show_spinner=False)
+def _uc_pool() -> ThreadPoolExecutor:
+    # Reused worker threads for timeout-bound UC lookups instead of a new thread per call
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="uc")
+
+
+def _run_with_timeout(fn, args=(), kwargs=None, timeout: int = 8):
+    fut = _uc_pool().submit(fn, *args, **(kwargs or {}))
+    try:
+        return fut.result(timeout=timeout)
+    except FuturesTimeout:
+        # Drops the call if it has not started; a running query finishes in the background
+        fut.cancel()
+        return {"_timeout": True}
+
+
+class _ComplianceTimeout(Exception):
+    """Raised out of the cached lookup so a timeout is never stored as a result."""
+
+
+@st.cache_data(ttl=300, max_entries=256, show_spinner=False)
+def _compliance_within(brief_id: str, timeout: int) -> Dict[str, Any]:
+    # Cache hits skip the pool hop entirely; a timed-out query still fills
+    # get_compliance_from_uc's cache in the background for the next rerun
+    res = _run_with_timeout(get_compliance_from_uc, args=(brief_id,), timeout=timeout)
+    if isinstance(res, dict) and res.get("_timeout"):
+        raise _ComplianceTimeout
+    return res or {}
+
+
+def get_compliance_from_uc_timeout(brief_id: str, timeout: int = 8) -> Dict[str, Any]:
+    try:
+        return _compliance_within(brief_id, timeout)
+    except _ComplianceTimeout:
+        return {"status": "error", "message": f"UC fetch timed out after {timeout}s"}
 
 
 def get_generated_image_b64_from_uc(brief_id: str) -> Optional[str]:
     try:
-        return _provider.get_generated_image_b64(brief_id)
+        img = get_data_source().get_generated_image_b64(brief_id)
     except Exception:
-        return None
+        img = None
+    if img:
+        return img
+    return _fetch_latest_image(brief_id)
 
 
 def get_handoff_output(params: Dict[str, Any]) -> Dict[str, Any]:
     try:
-        return _provider.get_handoff_output(params)
+        return get_data_source().get_handoff_output(params)
     except Exception:
-        return {"output": {}}
+        return _EMPTY_OUTPUT
 
 
 def get_analysis_output(params: Dict[str, Any]) -> Dict[str, Any]:
     try:
-        return _provider.get_analysis_output(params)
+        return get_data_source().get_analysis_output(params)
     except Exception:
-        return {"output": {}}
+        return _EMPTY_OUTPUT
 
 
-def generate_approval_checklist_from_compliance(compliance: Dict[str, Any]) -> Dict[str, Any]:
+def _thaw(value: Any) -> Any:
+    # Plain-dict copy of read-only provider results: st.cache_data pickles values, mappingproxy can't be pickled
+    if isinstance(value, Mapping):
+        return {k: _thaw(v) for k, v in value.items()}
+    return value
+
+
+def get_brief_bundle(brief_id: str) -> Dict[str, Any]:
     """
-    Keep contract compatible with the existing UI, but return an empty checklist
-    by default to avoid mock/sample data in the template.
+    One provider call for the Handoff and Analysis outputs of a brief. Providers
+    that cannot serve the bundle fall back to the individual lookups. Compliance
+    is not part of it, so these steps never wait on the compliance query.
     """
-    return {"total_items": 0, "items": []}
+    try:
+        bundle = get_data_source().get_brief_bundle(brief_id)
+        return {"handoff": _thaw(bundle["handoff"]), "analysis": _thaw(bundle["analysis"])}
+    except Exception:
+        params = {"brief_id": brief_id}
+        return {
+            "handoff": _thaw(get_handoff_output(params)),
+            "analysis": _thaw(get_analysis_output(params)),
+        }
 
-import os
-import time
-import json
-from typing import Optional, Dict, Any, List
 
-import streamlit as st  # type: ignore
-from config import get_generated_creatives_table  # type: ignore
+# Independent lookups (compliance, image, prompt) can run concurrently, so keep a few warm
+# connections rather than a single serialized one
+UC_POOL_SIZE = 4
 
 
-def normalize_brief(brief: dict, defaults: dict) -> dict:
-    return {
-        "type": brief.get("type") or defaults.get("type"),
-        "audience": brief.get("audience") or defaults.get("audience"),
-        "budget": brief.get("budget") if brief.get("budget") not in (None, "", 0) else defaults.get("budget"),
-        "timeline": brief.get("timeline") or defaults.get("timeline"),
-        "brief": brief.get("brief") or defaults.get("brief"),
-    }
+def _open_connection():
+    """Open a SQL Warehouse connection; raises on failure."""
+    from databricks import sql  # type: ignore
+    from databricks.sdk.core import Config  # type: ignore
 
+    cfg = Config()
+    # Prefer DATABRICKS_WAREHOUSE_ID; fall back to SQL_WAREHOUSE_ID
+    warehouse_id = os.environ.get("DATABRICKS_WAREHOUSE_ID") or os.environ.get("SQL_WAREHOUSE_ID")
+    if not warehouse_id:
+        raise RuntimeError("DATABRICKS_WAREHOUSE_ID (or SQL_WAREHOUSE_ID) not set")
+    connection = sql.connect(
+        server_hostname=cfg.host,
+        http_path=f"/sql/1.0/warehouses/{warehouse_id}",
+        credentials_provider=lambda: cfg.authenticate,
+    )
+    return connection
 
-def get_handoff_output(params: Dict[str, Any]) -> Dict[str, Any]:
-    """
-    Placeholder: returns an empty handoff plan.
-    Replace with your implementation to fetch handoff/readiness data.
-    """
-    return {
-        "output": {
-            "readiness_status": "PENDING",
-            "go_live_timestamp": "-",
-            "channels": [],
-            "budget_allocation": {},
-            "monitoring_metrics": [],
-            "assignees": {},
-        }
-    }
 
+def _close_quietly(resource) -> None:
+    try:
+        resource.close()
+    except Exception:
+        pass
 
-def get_analysis_output(params: dict) -> dict:
-    """
-    Placeholder: returns empty analysis.
-    Replace with your implementation that fetches real performance metrics/findings.
-    """
-    return {
-        "output": {
-            "performance_metrics": [],
-            "key_findings": [],
-            "next_iteration_brief": {}
-        }
-    }
+
+class UCConnectionError(RuntimeError):
+    """Warehouse connection failure; the message is the one shown to the user."""
+
+
+def _connect():
+    try:
+        return _open_connection()
+    except ImportError:
+        raise UCConnectionError("❌ Databricks connector not available. Please install databricks-sql-connector.") from None
+    except Exception as e:
+        raise UCConnectionError(f"❌ Connection failed: {e}") from e
 
 
 def get_databricks_connection():
     """
     Connect to Databricks SQL Warehouse using databricks-sdk for auth context
     and databricks-sql-connector for the connection.
+    Queries should go through uc_cursor(), which pools these connections.
     """
     try:
-        from databricks import sql  # type: ignore
-        from databricks.sdk.core import Config  # type: ignore
-    except Exception:
-        # Streamlit-safe: avoid crashing if connector not installed
-        import streamlit as st  # type: ignore
-        st.error("❌ Databricks connector not available. Please install databricks-sql-connector.")
-        return None
-    try:
-        cfg = Config()
-        # Prefer DATABRICKS_WAREHOUSE_ID; fall back to SQL_WAREHOUSE_ID
-        warehouse_id = os.environ.get("DATABRICKS_WAREHOUSE_ID") or os.environ.get("SQL_WAREHOUSE_ID")
-        if not warehouse_id:
-            import streamlit as st  # type: ignore
-            st.error("❌ DATABRICKS_WAREHOUSE_ID (or SQL_WAREHOUSE_ID) not set")
-            return None
-        connection = sql.connect(
-            server_hostname=cfg.host,
-            http_path=f"/sql/1.0/warehouses/{warehouse_id}",
-            credentials_provider=lambda: cfg.authenticate,
-        )
-        return connection
-    except Exception as e:
-        import streamlit as st  # type: ignore
-        st.error(f"❌ Connection failed: {e}")
+        return _connect()
+    except UCConnectionError as e:
+        # Streamlit-safe: report instead of crashing if the connector is missing or unreachable
+        st.error(str(e))
         return None
 
 
-@st.cache_data(ttl=300, show_spinner=False)
-def get_compliance_from_uc(brief_id: str) -> Dict[str, Any]:
+@st.cache_resource(show_spinner=False)
+def _connection_pool():
     """
-    Placeholder: returns empty compliance record.
-    Replace with a query to your Unity Catalog tables/views.
+    Process-wide pool of idle warehouse connections instead of a TLS/auth handshake
+    per query. The connector's connections are not thread-safe, so each one is
+    lent to a single borrower at a time; the semaphore bounds open connections.
     """
-    return {}
+    idle = queue.LifoQueue(maxsize=UC_POOL_SIZE)
+    atexit.register(_drain_pool, idle)
+    return idle, threading.BoundedSemaphore(UC_POOL_SIZE)
 
 
-def _run_with_timeout(fn, args=(), kwargs=None, timeout: int = 8):
-    import threading
-    kwargs = kwargs or {}
-    result_holder: Dict[str, Any] = {}
-    error_holder: Dict[str, Any] = {}
-
-    def _target():
+def _drain_pool(idle: "queue.LifoQueue") -> None:
+    while True:
         try:
-            result_holder["value"] = fn(*args, **kwargs)
-        except Exception as e:
-            error_holder["error"] = e
-
-    t = threading.Thread(target=_target, daemon=True)
-    t.start()
-    t.join(timeout)
-    if t.is_alive():
-        return {"_timeout": True}
-    if "error" in error_holder:
-        raise error_holder["error"]
-    return result_holder.get("value")
+            _close_quietly(idle.get_nowait())
+        except queue.Empty:
+            return
 
 
-def get_compliance_from_uc_timeout(brief_id: str, timeout: int = 8) -> Dict[str, Any]:
-    res = _run_with_timeout(get_compliance_from_uc, args=(brief_id,), timeout=timeout)
-    if isinstance(res, dict) and res.get("_timeout"):
-        return {"status": "error", "message": f"UC fetch timed out after {timeout}s"}
-    return res or {}
+def _reusable_cursor(conn):
+    """One cursor kept on each pooled connection and reused by every borrower of it."""
+    cursor = getattr(conn, "_reusable_cursor", None)
+    if cursor is None:
+        cursor = conn.cursor()
+        conn._reusable_cursor = cursor
+    return cursor
 
 
-@st.cache_data(ttl=300, show_spinner=False)
-def get_generated_image_b64_from_uc(brief_id: str) -> Optional[str]:
-    try:
-        conn = get_databricks_connection()
+@contextmanager
+def uc_cursor(raise_errors: bool = False):
+    """
+    Borrow a cursor on a pooled connection; yields None when the warehouse is unreachable.
+    With raise_errors, a failed connect raises UCConnectionError instead of calling st.error,
+    for lookups on worker threads where Streamlit drops elements.
+    """
+    idle, slots = _connection_pool()
+    with slots:
+        try:
+            conn = idle.get_nowait()
+        except queue.Empty:
+            conn = _connect() if raise_errors else get_databricks_connection()
         if not conn:
-            return None
-        cursor = None
+            yield None
+            return
+        cursor = _reusable_cursor(conn)
         try:
-            cursor = conn.cursor()
-            table_name = get_generated_creatives_table()
-            cursor.execute(
-                f"""
-                SELECT generated_image_b64
-                FROM {table_name}
-                WHERE brief_id = ?
-                ORDER BY generation_timestamp DESC
-                LIMIT 1
-                """,
-                (brief_id,)
-            )
-            row = cursor.fetchone()
-            return row[0] if row and row[0] else None
-        finally:
-            try:
-                if cursor:
-                    cursor.close()
-            except Exception:
-                pass
-            try:
-                conn.close()
-            except Exception:
-                pass
-    except Exception:
-        return None
+            yield cursor
+        except Exception:
+            # Discard the (possibly broken) connection so the next borrower reconnects
+            _close_quietly(cursor)
+            _close_quietly(conn)
+            raise
+        idle.put_nowait(conn)
+
+
+# Each lookup selects only the columns it renders
+LATEST_PROMPT_COLUMNS = ("expert_prompt", "expert_prompt_preview")
+LATEST_IMAGE_COLUMNS = ("generated_image_b64",)
 
-@st.cache_data(ttl=300, show_spinner=False)
-def get_latest_creative_record(brief_id: str) -> Dict[str, Any]:
-    rows: List[Dict[str, Any]] = []
+
+@lru_cache(maxsize=None)
+def _latest_creative_sql(columns: Tuple[str, ...]) -> str:
+    # Row keys come from the column tuple, so cursor.description is never re-read per lookup
+    return f"""
+    SELECT {", ".join(columns)}
+    FROM {get_generated_creatives_table()}
+    WHERE brief_id = ?
+    ORDER BY generation_timestamp DESC
+    LIMIT 1
+"""
+
+
+def _fetch_latest_creative(
+    brief_id: str, columns: Tuple[str, ...], raise_errors: bool = False
+) -> Dict[str, Any]:
     try:
-        conn = get_databricks_connection()
-        if not conn:
-            return {}
-        cursor = None
-        try:
-            cursor = conn.cursor()
-            table_name = get_generated_creatives_table()
-            cursor.execute(
-                f"""
-                SELECT
-                    brief_id,
-                    brief_title,
-                    campaign_name,
-                    expert_prompt,
-                    expert_prompt_preview,
-                    key_message,
-                    lifecycle_stage,
-                    seed_image_path,
-                    seed_image_b64,
-                    generated_image_path,
-                    generated_image_b64,
-                    generation_timestamp,
-                    target_segment
-                FROM {table_name}
-                WHERE brief_id = ?
-                ORDER BY generation_timestamp DESC
-                LIMIT 1
-                """,
-                (brief_id,)
-            )
-            cols = [d[0] for d in (cursor.description or [])]
+        with uc_cursor(raise_errors) as cursor:
+            if cursor is None:
+                return {}
+            cursor.execute(_latest_creative_sql(columns), (brief_id,))
             rec = cursor.fetchone()
-            if rec:
-                try:
-                    return {cols[i]: rec[i] for i in range(len(cols))}
-                except Exception:
-                    return {}
-            return {}
-        finally:
-            try:
-                if cursor:
-                    cursor.close()
-            except Exception:
-                pass
-            try:
-                conn.close()
-            except Exception:
-                pass
+        return dict(zip(columns, rec)) if rec else {}
+    except UCConnectionError:
+        raise
     except Exception:
         return {}
 
-@st.cache_data(ttl=300, show_spinner=False)
+
+def _fetch_latest_image(brief_id: str) -> Optional[str]:
+    # Runs on a fetch worker: connection failures propagate so the caller can report them
+    return _fetch_latest_creative(brief_id, LATEST_IMAGE_COLUMNS, raise_errors=True).get("generated_image_b64") or None
+
+
+class _ImageMiss(Exception):
+    """Raised out of the cached image lookup so a miss is never stored as a result."""
+
+
+# Only the decoded bytes are cached: base64 text is a third larger and st.image takes bytes directly
+@st.cache_data(ttl=3600, max_entries=64, show_spinner=False)
+def _generated_image_bytes(brief_id: str) -> bytes:
+    # Misses include failed queries and creatives not written yet, so they are retried on the next rerun
+    img_b64 = get_generated_image_b64_from_uc(brief_id)
+    if not img_b64:
+        raise _ImageMiss
+    try:
+        return base64.b64decode(img_b64)
+    except Exception:
+        raise _ImageMiss from None
+
+
+def get_generated_image_bytes_from_uc(brief_id: str) -> Optional[bytes]:
+    try:
+        return _generated_image_bytes(brief_id)
+    except _ImageMiss:
+        return None
+
+
+@st.cache_data(ttl=300, max_entries=256, show_spinner=False)
 def get_expert_prompt_from_uc(brief_id: str) -> Optional[str]:
-    rec = get_latest_creative_record(brief_id)
-    if not isinstance(rec, dict) or not rec:
+    rec = _fetch_latest_creative(brief_id, LATEST_PROMPT_COLUMNS)
+    if not rec:
         return None
     prompt = rec.get("expert_prompt") or rec.get("expert_prompt_preview")
     if isinstance(prompt, (bytes, bytearray)):
@@ -1,4 +1,5 @@
 import streamlit as st  # type: ignore
+import copy
 from datetime import datetime
 import json
 from typing import Optional, Dict, Any
@@ -6,17 +7,15 @@ import time
 import os  
 from PIL import Image  # type: ignore
 import html
-import pandas as pd  # type: ignore
 import base64
-from io import BytesIO
-import importlib
-import util
 from util import (
     normalize_brief as _normalize_brief,
     get_handoff_output,
+    get_analysis_output,
     get_compliance_from_uc_timeout,
     get_generated_image_b64_from_uc,
     generate_approval_checklist_from_compliance,
+    uc_executor,
 )
 
 
@@ -94,25 +93,60 @@ BRIEFS_DATA = [
     }
 ]
 
+# Brief lookup and audience picker options, derived once from BRIEFS_DATA
+BRIEFS_BY_ID = {b.get("brief_id"): b for b in BRIEFS_DATA if b.get("brief_id")}
+SEGMENT_OPTIONS = sorted({b.get("target_segment") for b in BRIEFS_DATA if b.get("target_segment")})
+
+
+# One translate pass instead of html.escape's chain of replaces; same output as html.escape(quote=True)
+_HTML_ESCAPE_TABLE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#x27;"})
+
+
+def _esc(value: Any) -> str:
+    return str(value).translate(_HTML_ESCAPE_TABLE)
+
+
+def _constraint_text(value: Any) -> str:
+    return ", ".join(value) if isinstance(value, list) else str(value or "-")
+
+
+# Escaped constraint text per brief for the Brief Summary card; it never changes at runtime
+BRIEF_CONSTRAINTS_HTML = {
+    bid: {
+        "medical": _esc(_constraint_text(b.get("medical_constraints"))),
+        "legal": _esc(_constraint_text(b.get("legal_requirements"))),
+    }
+    for bid, b in BRIEFS_BY_ID.items()
+}
+NO_CONSTRAINTS_HTML = {"medical": "-", "legal": "-"}
+
 # Enrich PRODUCTION_CAMPAIGNS with lifecycle/key message/segment/constraints from BRIEFS_DATA
-try:
-    _BRIEFS_BY_ID = {b.get("brief_id"): b for b in BRIEFS_DATA if b.get("brief_id")}
-    for _k, _c in PRODUCTION_CAMPAIGNS.items():
-        _bid = _c.get("brief_id")
-        _b = _BRIEFS_BY_ID.get(_bid) if _bid else None
-        if _b:
-            if "lifecycle_stage" not in _c:
-                _c["lifecycle_stage"] = _b.get("lifecycle_stage")
-            if "key_message" not in _c:
-                _c["key_message"] = _b.get("key_message")
-            if "target_segment" not in _c:
-                _c["target_segment"] = _b.get("target_segment")
-            if "medical_constraints" not in _c:
-                _c["medical_constraints"] = _b.get("medical_constraints")
-            if "legal_requirements" not in _c:
-                _c["legal_requirements"] = _b.get("legal_requirements")
-except Exception:
-    pass
+_ENRICH_FIELDS = ("lifecycle_stage", "key_message", "target_segment", "medical_constraints", "legal_requirements")
+for _c in PRODUCTION_CAMPAIGNS.values():
+    _b = BRIEFS_BY_ID.get(_c.get("brief_id"))
+    if _b:
+        _c.update({k: _b[k] for k in _ENRICH_FIELDS if k not in _c and k in _b})
+
+# Campaign picker options and labels, built once per run and shared by both pickers
+CAMPAIGN_KEYS = list(PRODUCTION_CAMPAIGNS.keys())
+CAMPAIGN_LABELS = {k: f"{k} — {c.get('campaign_name', k)}" for k, c in PRODUCTION_CAMPAIGNS.items()}
+
+BRIEF_SUMMARY_HTML = (
+    "<div class='card' style='margin-top:8px;'>"
+    "<div class='card-header'><h5 class='card-title' style='margin:0;'>Brief Summary</h5></div>"
+    "<div class='brief-grid' style='margin-top:8px;'>"
+    "<div class='brief-item'><div class='brief-item-label'>Title</div><div class='brief-item-value'>{title}</div></div>"
+    "<div class='brief-item'><div class='brief-item-label'>Target Segment</div><div class='brief-item-value'>{segment}</div></div>"
+    "<div class='brief-item'><div class='brief-item-label'>Campaign Type</div><div class='brief-item-value'>{type}</div></div>"
+    "<div class='brief-item'><div class='brief-item-label'>Lifecycle</div><div class='brief-item-value'>{lifecycle}</div></div>"
+    "<div class='brief-item'><div class='brief-item-label'>Medical Constraints</div><div class='brief-item-value'>{medical}</div></div>"
+    "<div class='brief-item'><div class='brief-item-label'>Legal Requirements</div><div class='brief-item-value'>{legal}</div></div>"
+    "</div>"
+    "</div>"
+)
+
+FINDING_LI_PREFIX = "<li style='margin:8px 0;color:#1a1a1a;font-size:13px;line-height:1.6'>"
+FINDING_LI_SUFFIX = "</li>"
 
 
 # ============================================================
@@ -120,33 +154,46 @@ except Exception:
 # ============================================================
 
 
-try:
-    _flo_logo_path = os.path.join(APP_BASE_DIR, "images", "brand_logo.png")
-    _flo_page_icon = Image.open(_flo_logo_path)
-except Exception:
-    _flo_page_icon = "🎯"
+@st.cache_resource(show_spinner=False)
+def _brand_logo() -> Optional[Image.Image]:
+    # Decoded once per process and shared by the page icon and the header
+    try:
+        logo = Image.open(os.path.join(APP_BASE_DIR, "images", "brand_logo.png"))
+        logo.load()
+        return logo
+    except Exception:
+        return None
 
 
 st.set_page_config(
     page_title="Flo Campaign Workflow",
-    page_icon=_flo_page_icon,
+    page_icon=_brand_logo() or "🎯",
     layout="wide",
     initial_sidebar_state="expanded"
 )
 
 
+# Try common filenames in order of preference
+CSS_CANDIDATES = ("style.css", "style_css.css", "styles.css")
+
+
+@st.cache_data(show_spinner=False)
+def _read_css(path: str, mtime: float) -> str:
+    # mtime is only part of the cache key, so editing the stylesheet invalidates it
+    with open(path, "r") as f:
+        return f.read()
+
+
 # Load external CSS
 def load_css():
-    # Try common filenames in order of preference
-    candidates = ["style.css", "style_css.css", "styles.css"]
-    for name in candidates:
+    for name in CSS_CANDIDATES:
         css_file = os.path.join(APP_BASE_DIR, name)
         try:
-            with open(css_file, "r") as f:
-                st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
-                return
+            mtime = os.stat(css_file).st_mtime
         except FileNotFoundError:
             continue
+        st.markdown(f"<style>{_read_css(css_file, mtime)}</style>", unsafe_allow_html=True)
+        return
     st.warning("CSS file not found (tried style.css, style_css.css, styles.css). Using default styles.")
 
 
@@ -158,10 +205,17 @@ load_css()
 # ============================================================
 
 
-if "campaign_id" not in st.session_state:
-    st.session_state.campaign_id = None
-if "workflow_state" not in st.session_state:
-    st.session_state.workflow_state = {
+DEFAULT_BRIEF = {
+    "type": "Awareness",
+    "audience": "Women 18-35, health-conscious, digital-native",
+    "budget": 250000,
+    "timeline": "6 weeks",
+    "brief": "Increase awareness, drive feature adoption, and build community. KPIs: CTR > 1.2%, Conversion > 4.5%, ROAS > 3.5x."
+}
+
+_SESSION_DEFAULTS = {
+    "campaign_id": None,
+    "workflow_state": {
         "step": 0,
         "agent": "idle",
         "briefing_approved": False,
@@ -170,24 +224,18 @@ if "workflow_state" not in st.session_state:
         "handoff_approved": False,
         "analysis_complete": False,
         "messages": []
-    }
-if "approval_feedback" not in st.session_state:
-    st.session_state.approval_feedback = {}
-if "compliance_result" not in st.session_state:
-    st.session_state.compliance_result = None
-
-
-DEFAULT_BRIEF = {
-    "type": "Awareness",
-    "audience": "Women 18-35, health-conscious, digital-native",
-    "budget": 250000,
-    "timeline": "6 weeks",
-    "brief": "Increase awareness, drive feature adoption, and build community. KPIs: CTR > 1.2%, Conversion > 4.5%, ROAS > 3.5x."
+    },
+    "approval_feedback": {},
+    "compliance_result": None,
+    "campaign_brief": DEFAULT_BRIEF,
 }
+# Defaults that are mutated in place during a session get their own copy
+_MUTABLE_SESSION_KEYS = frozenset({"workflow_state", "approval_feedback", "campaign_brief"})
 
-
-if "campaign_brief" not in st.session_state:
-    st.session_state.campaign_brief = DEFAULT_BRIEF.copy()
+# Set once per session; later reruns only probe the keys
+for _key, _default in _SESSION_DEFAULTS.items():
+    if _key not in st.session_state:
+        st.session_state[_key] = copy.deepcopy(_default) if _key in _MUTABLE_SESSION_KEYS else _default
 
 
 # ============================================================
@@ -207,9 +255,10 @@ def normalize_brief(brief: dict) -> dict:
 def render_header():
     col1, col2, col3 = st.columns([1, 3, 1])
     with col1:
-        try:
-            st.image(os.path.join(APP_BASE_DIR, "images", "brand_logo.png"), width=120)
-        except Exception:
+        logo = _brand_logo()
+        if logo is not None:
+            st.image(logo, width=120)
+        else:
             st.markdown("### 🎯 Flo")
     with col2:
         st.title("Campaign Workflow Automation")
@@ -219,126 +268,122 @@ def render_header():
             st.metric("Campaign ID", st.session_state.campaign_id)
 
 
-def render_workflow_progress():
-    steps = [("📋", "Briefing"), ("🎨", "Production"), ("✅", "Compliance"), ("🚀", "Handoff"), ("📊", "Analysis")]
-    current = st.session_state.workflow_state["step"]
+WORKFLOW_STEPS = (("📋", "Briefing"), ("🎨", "Production"), ("✅", "Compliance"), ("🚀", "Handoff"), ("📊", "Analysis"))
+CAMPAIGN_TYPES = ("Awareness", "Acquisition", "Retention", "Engagement")
 
-    st.markdown('<div class="workflow-stepper-container">', unsafe_allow_html=True)
 
+@st.cache_data(show_spinner=False)
+def _stepper_html(current: int) -> str:
+    # Depends only on the step index: one cached variant per step, reused across reruns
     parts = []
-    for idx, (icon, _) in enumerate(steps):
+    for idx, (icon, _) in enumerate(WORKFLOW_STEPS):
         cls = "workflow-step"
         if idx < current:
             cls += " complete"
         elif idx == current:
             cls += " active"
         parts.append(f"<div class='{cls}'>{icon}</div>")
-        if idx < len(steps) - 1:
+        if idx < len(WORKFLOW_STEPS) - 1:
             conn_cls = "workflow-connector"
             if idx < current:
                 conn_cls += " complete"
             parts.append(f"<div class='{conn_cls}'><div class='progress'></div></div>")
-
-    st.markdown(f'<div class="workflow-stepper">{"".join(parts)}</div>', unsafe_allow_html=True)
-
     lbls = []
-    for idx, (_, name) in enumerate(steps):
+    for idx, (_, name) in enumerate(WORKFLOW_STEPS):
         lcls = "workflow-label"
         if idx < current:
             lcls += " complete"
         elif idx == current:
             lcls += " active"
         lbls.append(f"<div class='{lcls}'>{name}</div>")
-    st.markdown(f'<div class="workflow-labels">{"".join(lbls)}</div>', unsafe_allow_html=True)
+    return (
+        '<div class="workflow-stepper-container">'
+        f'<div class="workflow-stepper">{"".join(parts)}</div>'
+        f'<div class="workflow-labels">{"".join(lbls)}</div>'
+        "</div>"
+    )
 
-    st.markdown('</div>', unsafe_allow_html=True)
+
+def render_workflow_progress():
+    st.markdown(_stepper_html(st.session_state.workflow_state["step"]), unsafe_allow_html=True)
 
 
 def render_campaign_brief_input():
     st.subheader("📝 Campaign Brief Input")
     current = st.session_state.campaign_brief
 
-    col1, col2 = st.columns(2)
-    with col1:
-        allowed_types = ["Awareness", "Acquisition", "Retention", "Engagement"]
-        current_type = current.get("type", DEFAULT_BRIEF["type"])
-        selected_index = allowed_types.index(current_type) if current_type in allowed_types else 0
-        campaign_type = st.selectbox("Campaign Type", allowed_types, index=selected_index, key="campaign_type")
-    with col2:
-        # Build audience options from BRIEFS_DATA target segments
-        segment_options = sorted({b.get("target_segment") for b in BRIEFS_DATA if b.get("target_segment")})
-        current_aud = current.get("audience", DEFAULT_BRIEF["audience"])
-        seg_index = segment_options.index(current_aud) if current_aud in segment_options else 0
-        selected_segment = st.selectbox("Target Audience", segment_options, index=seg_index, key="target_audience_segment")
+    # Edits are batched in a form: the app reruns once on Apply instead of on every widget change
+    with st.form("brief_form", clear_on_submit=False):
+        col1, col2 = st.columns(2)
+        with col1:
+            current_type = current.get("type", DEFAULT_BRIEF["type"])
+            selected_index = CAMPAIGN_TYPES.index(current_type) if current_type in CAMPAIGN_TYPES else 0
+            campaign_type = st.selectbox("Campaign Type", CAMPAIGN_TYPES, index=selected_index, key="campaign_type")
+        with col2:
+            current_aud = current.get("audience", DEFAULT_BRIEF["audience"])
+            seg_index = SEGMENT_OPTIONS.index(current_aud) if current_aud in SEGMENT_OPTIONS else 0
+            selected_segment = st.selectbox("Target Audience", SEGMENT_OPTIONS, index=seg_index, key="target_audience_segment")
+
+        col1, col2 = st.columns(2)
+        with col1:
+            budget = st.number_input("Budget ($)", value=int(current.get("budget", DEFAULT_BRIEF["budget"])), step=10000, key="budget")
+        with col2:
+            timeline = st.text_input(
+                "Timeline",
+                value=current.get("timeline", DEFAULT_BRIEF["timeline"]) if isinstance(current.get("timeline"), str) else DEFAULT_BRIEF["timeline"],
+                placeholder="e.g., 6 weeks",
+                key="timeline"
+            )
 
-    col1, col2 = st.columns(2)
-    with col1:
-        budget = st.number_input("Budget ($)", value=int(current.get("budget", DEFAULT_BRIEF["budget"])), step=10000, key="budget")
-    with col2:
-        timeline = st.text_input(
-            "Timeline",
-            value=current.get("timeline", DEFAULT_BRIEF["timeline"]) if isinstance(current.get("timeline"), str) else DEFAULT_BRIEF["timeline"],
-            placeholder="e.g., 6 weeks",
-            key="timeline"
+        brief_value = current.get("brief", DEFAULT_BRIEF["brief"])
+        if not isinstance(brief_value, str):
+            try:
+                brief_value = json.dumps(brief_value, ensure_ascii=False)
+            except Exception:
+                brief_value = str(brief_value)
+
+        campaign_brief_text = st.text_area(
+            "Campaign Objectives",
+            value=brief_value,
+            placeholder="Describe campaign goals, key messages, and success criteria...",
+            height=100,
+            key="campaign_brief_text"
         )
+        submitted = st.form_submit_button("Apply Brief")
 
-    brief_value = current.get("brief", DEFAULT_BRIEF["brief"])
-    if not isinstance(brief_value, str):
-        try:
-            brief_value = json.dumps(brief_value, ensure_ascii=False)
-        except Exception:
-            brief_value = str(brief_value)
-
-    campaign_brief_text = st.text_area(
-        "Campaign Objectives",
-        value=brief_value,
-        placeholder="Describe campaign goals, key messages, and success criteria...",
-        height=100,
-        key="campaign_brief_text"
-    )
-
-    normalized = normalize_brief({
+    inputs = {
         "type": campaign_type,
         "audience": selected_segment,
         "budget": budget,
         "timeline": timeline,
         "brief": campaign_brief_text
-    })
-    st.session_state.campaign_brief = normalized
+    }
+    # Re-applying inputs that match the stored brief skips normalizing again. Comparing against
+    # the brief itself stays correct when main() replaces or edits it on a campaign switch.
+    if submitted and any(current.get(k) != v for k, v in inputs.items()):
+        st.session_state.campaign_brief = normalize_brief(inputs)
+    normalized = st.session_state.campaign_brief
 
     # Inline Brief Summary (concise)
     meta = st.session_state.get("campaign_meta", {})
     bid = meta.get("brief_id")
-    bd = {}
-    try:
-        bd = next((b for b in BRIEFS_DATA if b.get("brief_id") == bid), {})
-    except Exception:
-        bd = {}
-    title_val = bd.get("brief_title") or meta.get("brief_title") or "-"
-    segment_val = bd.get("target_segment") or normalized.get("audience") or "-"
-    type_val = bd.get("campaign_type") or normalized.get("type") or "-"
-    key_msg_val = bd.get("key_message") or "-"
-    lifecycle_val = bd.get("lifecycle_stage") or "-"
-    med_cons_val = ", ".join(bd.get("medical_constraints") or []) if isinstance(bd.get("medical_constraints"), list) else str(bd.get("medical_constraints") or "-")
-    legal_reqs_val = ", ".join(bd.get("legal_requirements") or []) if isinstance(bd.get("legal_requirements"), list) else str(bd.get("legal_requirements") or "-")
-    st.markdown(
-        "<div class='card' style='margin-top:8px;'>"
-        "<div class='card-header'><h5 class='card-title' style='margin:0;'>Brief Summary</h5></div>"
-        "<div class='brief-grid' style='margin-top:8px;'>"
-        f"<div class='brief-item'><div class='brief-item-label'>Title</div><div class='brief-item-value'>{html.escape(str(title_val))}</div></div>"
-        f"<div class='brief-item'><div class='brief-item-label'>Target Segment</div><div class='brief-item-value'>{html.escape(str(segment_val))}</div></div>"
-        f"<div class='brief-item'><div class='brief-item-label'>Campaign Type</div><div class='brief-item-value'>{html.escape(str(type_val))}</div></div>"
-        f"<div class='brief-item'><div class='brief-item-label'>Lifecycle</div><div class='brief-item-value'>{html.escape(str(lifecycle_val))}</div></div>"
-        f"<div class='brief-item'><div class='brief-item-label'>Medical Constraints</div><div class='brief-item-value'>{html.escape(med_cons_val)}</div></div>"
-        f"<div class='brief-item'><div class='brief-item-label'>Legal Requirements</div><div class='brief-item-value'>{html.escape(legal_reqs_val)}</div></div>"
-        "</div>"
-        "</div>",
-        unsafe_allow_html=True
-    )
+    bd = BRIEFS_BY_ID.get(bid, {})
+    summary = {
+        "title": bd.get("brief_title") or meta.get("brief_title") or "-",
+        "segment": bd.get("target_segment") or normalized.get("audience") or "-",
+        "type": bd.get("campaign_type") or normalized.get("type") or "-",
+        "lifecycle": bd.get("lifecycle_stage") or "-",
+    }
+    fields = {k: _esc(v) for k, v in summary.items()}
+    fields.update(BRIEF_CONSTRAINTS_HTML.get(bid, NO_CONSTRAINTS_HTML))
+    st.markdown(BRIEF_SUMMARY_HTML.format_map(fields), unsafe_allow_html=True)
     return normalized
 
 
+@st.fragment
 def render_approval_section(agent_name: str, step_num: int):
+    # Runs as a fragment: typing feedback or requesting changes reruns only this panel.
+    # Approving advances the workflow, which gates the other tabs, so it reruns the app.
     st.markdown(f"### 👤 {agent_name} Approval")
     
     col1, col2 = st.columns([2, 1])
@@ -361,15 +406,13 @@ def render_approval_section(agent_name: str, step_num: int):
     if approve_clicked:
         st.session_state.workflow_state[approval_key] = True
         st.session_state.approval_feedback[agent_name] = feedback
-        st.success(f"✅ {agent_name} step approved!")
         st.session_state.workflow_state["step"] = step_num
-        return True
+        st.rerun()
     if reject_clicked:
         st.error(f"Changes requested for {agent_name} step. Please revise and resubmit.")
-        return False
+        return
     if st.session_state.workflow_state.get(approval_key, False):
         st.info(f"{agent_name} already approved.")
-    return False
 
 
 # ============================================================
@@ -387,17 +430,11 @@ def main():
 
     if not st.session_state.get("workflow_started", False):
 
-        def _format_campaign_top(opt_key: str) -> str:
-            c = PRODUCTION_CAMPAIGNS.get(opt_key, {})
-            name = c.get("campaign_name", opt_key)
-            return f"{opt_key} — {name}"
-
-        campaign_keys_top = list(PRODUCTION_CAMPAIGNS.keys())
         sel_key_top = st.selectbox(
             "Choose a campaign",
-            options=campaign_keys_top,
+            options=CAMPAIGN_KEYS,
             index=0,
-            format_func=_format_campaign_top,
+            format_func=CAMPAIGN_LABELS.__getitem__,
             key="selected_campaign_key"
         )
         sel_campaign = PRODUCTION_CAMPAIGNS[sel_key_top]
@@ -423,12 +460,12 @@ def main():
         st.markdown("##### Campaign Summary")
         st.markdown(
             "<div class='brief-grid' style='margin-top:8px;'>"
-            f"<div class='brief-item'><div class='brief-item-label'>Title</div><div class='brief-item-value'>{html.escape(meta.get('brief_title','-') or '-')}</div></div>"
-            f"<div class='brief-item'><div class='brief-item-label'>Campaign</div><div class='brief-item-value'>{html.escape(meta.get('campaign_name','-') or '-')}</div></div>"
-            f"<div class='brief-item'><div class='brief-item-label'>Type</div><div class='brief-item-value'>{html.escape(brief_card.get('type','-') or '-')}</div></div>"
-            f"<div class='brief-item'><div class='brief-item-label'>Lifecycle</div><div class='brief-item-value'>{html.escape(str(lifecycle))}</div></div>"
-            f"<div class='brief-item'><div class='brief-item-label'>Medical Constraints</div><div class='brief-item-value'>{html.escape(med_cons)}</div></div>"
-            f"<div class='brief-item'><div class='brief-item-label'>Legal Requirements</div><div class='brief-item-value'>{html.escape(legal_reqs)}</div></div>"
+            f"<div class='brief-item'><div class='brief-item-label'>Title</div><div class='brief-item-value'>{_esc(meta.get('brief_title','-') or '-')}</div></div>"
+            f"<div class='brief-item'><div class='brief-item-label'>Campaign</div><div class='brief-item-value'>{_esc(meta.get('campaign_name','-') or '-')}</div></div>"
+            f"<div class='brief-item'><div class='brief-item-label'>Type</div><div class='brief-item-value'>{_esc(brief_card.get('type','-') or '-')}</div></div>"
+            f"<div class='brief-item'><div class='brief-item-label'>Lifecycle</div><div class='brief-item-value'>{_esc(lifecycle)}</div></div>"
+            f"<div class='brief-item'><div class='brief-item-label'>Medical Constraints</div><div class='brief-item-value'>{_esc(med_cons)}</div></div>"
+            f"<div class='brief-item'><div class='brief-item-label'>Legal Requirements</div><div class='brief-item-value'>{_esc(legal_reqs)}</div></div>"
             "</div>",
             unsafe_allow_html=True
         )
@@ -470,7 +507,7 @@ def main():
         brief = st.session_state.campaign_brief
         meta = st.session_state.get("campaign_meta", {})
         # Show Campaign Summary above tabs (mirrors Dashboard card with extras)
-        selected_key_top = st.session_state.get("prod_selected_campaign_prev") or (list(PRODUCTION_CAMPAIGNS.keys())[0] if PRODUCTION_CAMPAIGNS else None)
+        selected_key_top = st.session_state.get("prod_selected_campaign_prev") or (CAMPAIGN_KEYS[0] if CAMPAIGN_KEYS else None)
         selected_campaign_top = PRODUCTION_CAMPAIGNS.get(selected_key_top, {}) if selected_key_top else {}
         lifecycle_top = selected_campaign_top.get("lifecycle_stage") or "-"
         med_top = ", ".join(selected_campaign_top.get("medical_constraints") or []) if isinstance(selected_campaign_top.get("medical_constraints"), list) else str(selected_campaign_top.get("medical_constraints") or "-")
@@ -479,12 +516,12 @@ def main():
         st.markdown("##### Campaign Summary")
         st.markdown(
             "<div class='brief-grid' style='margin-top:8px;'>"
-            f"<div class='brief-item'><div class='brief-item-label'>Title</div><div class='brief-item-value'>{html.escape(meta.get('brief_title','-') or '-')}</div></div>"
-            f"<div class='brief-item'><div class='brief-item-label'>Campaign</div><div class='brief-item-value'>{html.escape(meta.get('campaign_name','-') or '-')}</div></div>"
-            f"<div class='brief-item'><div class='brief-item-label'>Type</div><div class='brief-item-value'>{html.escape(brief.get('type','-') or '-')}</div></div>"
-            f"<div class='brief-item'><div class='brief-item-label'>Lifecycle</div><div class='brief-item-value'>{html.escape(str(lifecycle_top))}</div></div>"
-            f"<div class='brief-item'><div class='brief-item-label'>Medical Constraints</div><div class='brief-item-value'>{html.escape(med_top)}</div></div>"
-            f"<div class='brief-item'><div class='brief-item-label'>Legal Requirements</div><div class='brief-item-value'>{html.escape(legal_top)}</div></div>"
+            f"<div class='brief-item'><div class='brief-item-label'>Title</div><div class='brief-item-value'>{_esc(meta.get('brief_title','-') or '-')}</div></div>"
+            f"<div class='brief-item'><div class='brief-item-label'>Campaign</div><div class='brief-item-value'>{_esc(meta.get('campaign_name','-') or '-')}</div></div>"
+            f"<div class='brief-item'><div class='brief-item-label'>Type</div><div class='brief-item-value'>{_esc(brief.get('type','-') or '-')}</div></div>"
+            f"<div class='brief-item'><div class='brief-item-label'>Lifecycle</div><div class='brief-item-value'>{_esc(lifecycle_top)}</div></div>"
+            f"<div class='brief-item'><div class='brief-item-label'>Medical Constraints</div><div class='brief-item-value'>{_esc(med_top)}</div></div>"
+            f"<div class='brief-item'><div class='brief-item-label'>Legal Requirements</div><div class='brief-item-value'>{_esc(legal_top)}</div></div>"
             "</div>",
             unsafe_allow_html=True
         )
@@ -502,17 +539,11 @@ def main():
         with tabs[0]:
             st.subheader("📝 Briefing")
             # Campaign picker moved here
-            def _format_campaign_top(opt_key: str) -> str:
-                c = PRODUCTION_CAMPAIGNS.get(opt_key, {})
-                name = c.get("campaign_name", opt_key)
-                return f"{opt_key} — {name}"
-
-            campaign_keys_top = list(PRODUCTION_CAMPAIGNS.keys())
             sel_key_top = st.selectbox(
                 "Select campaign",
-                options=campaign_keys_top,
+                options=CAMPAIGN_KEYS,
                 index=0,
-                format_func=_format_campaign_top,
+                format_func=CAMPAIGN_LABELS.__getitem__,
                 key="brief_selected_campaign"
             )
             sel_campaign = PRODUCTION_CAMPAIGNS[sel_key_top]
@@ -562,12 +593,12 @@ def main():
             _legal_txt = ", ".join((_sel_obj.get('legal_requirements') or [])) if isinstance(_sel_obj.get('legal_requirements', []), list) else str((_sel_obj.get('legal_requirements')) or "-")
             st.markdown(
                 "<div class='brief-grid' style='margin-top:8px;'>"
-                f"<div class='brief-item'><div class='brief-item-label'>Title</div><div class='brief-item-value'>{html.escape(meta.get('brief_title','-') or '-')}</div></div>"
-                f"<div class='brief-item'><div class='brief-item-label'>Campaign</div><div class='brief-item-value'>{html.escape(meta.get('campaign_name','-') or '-')}</div></div>"
-                f"<div class='brief-item'><div class='brief-item-label'>Type</div><div class='brief-item-value'>{html.escape(brief_card.get('type','-') or '-')}</div></div>"
-                f"<div class='brief-item'><div class='brief-item-label'>Lifecycle</div><div class='brief-item-value'>{html.escape(_life_txt)}</div></div>"
-                f"<div class='brief-item'><div class='brief-item-label'>Medical Constraints</div><div class='brief-item-value'>{html.escape(_med_txt)}</div></div>"
-                f"<div class='brief-item'><div class='brief-item-label'>Legal Requirements</div><div class='brief-item-value'>{html.escape(_legal_txt)}</div></div>"
+                f"<div class='brief-item'><div class='brief-item-label'>Title</div><div class='brief-item-value'>{_esc(meta.get('brief_title','-') or '-')}</div></div>"
+                f"<div class='brief-item'><div class='brief-item-label'>Campaign</div><div class='brief-item-value'>{_esc(meta.get('campaign_name','-') or '-')}</div></div>"
+                f"<div class='brief-item'><div class='brief-item-label'>Type</div><div class='brief-item-value'>{_esc(brief_card.get('type','-') or '-')}</div></div>"
+                f"<div class='brief-item'><div class='brief-item-label'>Lifecycle</div><div class='brief-item-value'>{_esc(_life_txt)}</div></div>"
+                f"<div class='brief-item'><div class='brief-item-label'>Medical Constraints</div><div class='brief-item-value'>{_esc(_med_txt)}</div></div>"
+                f"<div class='brief-item'><div class='brief-item-label'>Legal Requirements</div><div class='brief-item-value'>{_esc(_legal_txt)}</div></div>"
                 "</div>",
                 unsafe_allow_html=True
             )
@@ -579,7 +610,7 @@ def main():
         with tabs[1]:
             st.subheader("🎨 Production Agent - Text-to-Image")
             # Use campaign selected in Briefing
-            selected_key = st.session_state.get("prod_selected_campaign_prev") or list(PRODUCTION_CAMPAIGNS.keys())[0]
+            selected_key = st.session_state.get("prod_selected_campaign_prev") or CAMPAIGN_KEYS[0]
             selected_campaign = PRODUCTION_CAMPAIGNS[selected_key]
 
             seed_image_path = selected_campaign.get("seed_image_path")
@@ -779,6 +810,8 @@ def main():
                     "- Content (10%): Inclusive representation, accuracy"
                 )
                 with st.spinner("🔎 Fetching compliance decision from UC..."):
+                    # Overlap the creative fetch with the compliance lookup (one RTT instead of two)
+                    img_future = uc_executor().submit(get_generated_image_b64_from_uc, brief_id)
                     compliance = get_compliance_from_uc_timeout(brief_id, timeout=8)
                 if not compliance:
                     st.warning(f"❌ No compliance record for {brief_id}")
@@ -788,11 +821,14 @@ def main():
                     col_img, col_det = st.columns([1, 1])
                     with col_img:
                         st.markdown("##### Generated Creative")
-                        img_b64 = get_generated_image_b64_from_uc(brief_id)
+                        try:
+                            img_b64 = img_future.result(timeout=8)
+                        except Exception:
+                            img_b64 = None
                         if img_b64:
                             try:
-                                img = Image.open(BytesIO(base64.b64decode(img_b64)))
-                                st.image(img, use_column_width=True)
+                                # Raw PNG bytes go straight to the frontend; no PIL decode/re-encode
+                                st.image(base64.b64decode(img_b64), use_column_width=True)
                             except Exception as e:
                                 st.warning(f"Could not display image: {e}")
                         else:
@@ -896,15 +932,7 @@ def main():
 
                         # Issues list (detailed)
                         st.markdown("###### Top Issues")
-                        try:
-                            issues_all = []
-                            raw_issues = compliance.get("issues_json")
-                            if isinstance(raw_issues, str) and raw_issues.strip():
-                                issues_all = json.loads(raw_issues)
-                            elif isinstance(raw_issues, list):
-                                issues_all = raw_issues
-                        except Exception:
-                            issues_all = []
+                        issues_all = compliance.get("issues") or []
                         # Rank issues by severity
                         sev_rank = {"CRITICAL": 0, "HIGH": 1, "MEDIUM": 2, "LOW": 3}
 
@@ -947,6 +975,7 @@ def main():
                         checklist = generate_approval_checklist_from_compliance(compliance)
                         st.markdown("###### Approval Checklist")
                         if checklist.get("total_items", 0) > 0:
+                            import pandas as pd  # type: ignore
                             df_chk = pd.DataFrame([
                                 {
                                     "Assignee": it.get("assignee"),
@@ -957,11 +986,7 @@ def main():
                         # else (removed)
                         #     st.write("No approvals required.")
                     # Approval workflow - standardized
-                    approved = render_approval_section("Compliance", 4)
-                    if approved:
-                        st.session_state.workflow_state["compliance_approved"] = True
-                        st.session_state.workflow_state["step"] = 4
-                        st.rerun()
+                    render_approval_section("Compliance", 4)
         
         # HANDOFF TAB
         with tabs[3]:
@@ -1023,6 +1048,7 @@ def main():
                 with col_budget:
                     st.markdown("#### 💰 Budget Split")
                     if budget:
+                        import pandas as pd  # type: ignore
                         budget_data = [{"Channel": k.title(), "Allocation": v} for k, v in budget.items()]
                         df_budget = pd.DataFrame(budget_data)
                         st.dataframe(
@@ -1090,22 +1116,14 @@ def main():
                 st.divider()
 
                 # ========== APPROVAL SECTION ==========
-                approved = render_approval_section("Handoff", 5)
-                if approved:
-                    st.session_state.workflow_state["handoff_approved"] = True
-                    st.session_state.workflow_state["step"] = 5
-                    st.rerun()
+                render_approval_section("Handoff", 5)
         # ANALYSIS TAB
         with tabs[4]:
             st.subheader("📊 Campaign Performance Analysis")
             
             # Get brief_id for contextualized analysis data
             brief_id = st.session_state.get("campaign_meta", {}).get("brief_id") or ""
-            try:
-                importlib.reload(util)
-            except Exception:
-                pass
-            analysis_output = util.get_analysis_output({"brief_id": brief_id})
+            analysis_output = get_analysis_output({"brief_id": brief_id})
             out = analysis_output.get("output", {})
             
             metrics = out.get("performance_metrics", []) or []
@@ -1121,47 +1139,18 @@ def main():
                 # Show top 3 metrics as big numbers
                 if metrics:
                     try:
-                        m1 = metrics[0]
-                        m2 = metrics[1]
-                        m3 = metrics[2]
-                        
-                        col1, col2, col3 = st.columns(3)
-                        
-                        with col1:
-                            status_color = "#2e7d32" if "↑" in m1.get("status", "") else "#d32f2f"
-                            st.markdown(
-                                f"<div style='padding:16px;border-radius:12px;background:#fafafa;border:1px solid #eee;'>"
-                                f"<div style='font-size:12px;color:#666;font-weight:600;margin-bottom:8px'>{html.escape(m1.get('metric', '-'))}</div>"
-                                f"<div style='font-size:32px;font-weight:700;color:#1a1a1a'>{m1.get('value', 0):.2f}</div>"
-                                f"<div style='font-size:13px;color:{status_color};font-weight:600;margin-top:8px'>{html.escape(m1.get('status', ''))}</div>"
-                                f"<div style='font-size:11px;color:#999;margin-top:6px;line-height:1.4'>{html.escape(m1.get('context', ''))}</div>"
-                                f"</div>",
-                                unsafe_allow_html=True
-                            )
-                        
-                        with col2:
-                            status_color = "#2e7d32" if "↑" in m2.get("status", "") else "#d32f2f"
-                            st.markdown(
-                                f"<div style='padding:16px;border-radius:12px;background:#fafafa;border:1px solid #eee;'>"
-                                f"<div style='font-size:12px;color:#666;font-weight:600;margin-bottom:8px'>{html.escape(m2.get('metric', '-'))}</div>"
-                                f"<div style='font-size:32px;font-weight:700;color:#1a1a1a'>{m2.get('value', 0):.2f}</div>"
-                                f"<div style='font-size:13px;color:{status_color};font-weight:600;margin-top:8px'>{html.escape(m2.get('status', ''))}</div>"
-                                f"<div style='font-size:11px;color:#999;margin-top:6px;line-height:1.4'>{html.escape(m2.get('context', ''))}</div>"
-                                f"</div>",
-                                unsafe_allow_html=True
-                            )
-                        
-                        with col3:
-                            status_color = "#2e7d32" if "↑" in m3.get("status", "") else "#d32f2f"
-                            st.markdown(
-                                f"<div style='padding:16px;border-radius:12px;background:#fafafa;border:1px solid #eee;'>"
-                                f"<div style='font-size:12px;color:#666;font-weight:600;margin-bottom:8px'>{html.escape(m3.get('metric', '-'))}</div>"
-                                f"<div style='font-size:32px;font-weight:700;color:#1a1a1a'>{m3.get('value', 0):.2f}</div>"
-                                f"<div style='font-size:13px;color:{status_color};font-weight:600;margin-top:8px'>{html.escape(m3.get('status', ''))}</div>"
-                                f"<div style='font-size:11px;color:#999;margin-top:6px;line-height:1.4'>{html.escape(m3.get('context', ''))}</div>"
-                                f"</div>",
-                                unsafe_allow_html=True
-                            )
+                        for col, m in zip(st.columns(3), metrics[:3]):
+                            with col:
+                                status_color = "#2e7d32" if "↑" in m.get("status", "") else "#d32f2f"
+                                st.markdown(
+                                    f"<div style='padding:16px;border-radius:12px;background:#fafafa;border:1px solid #eee;'>"
+                                    f"<div style='font-size:12px;color:#666;font-weight:600;margin-bottom:8px'>{html.escape(m.get('metric', '-'))}</div>"
+                                    f"<div style='font-size:32px;font-weight:700;color:#1a1a1a'>{m.get('value', 0):.2f}</div>"
+                                    f"<div style='font-size:13px;color:{status_color};font-weight:600;margin-top:8px'>{html.escape(m.get('status', ''))}</div>"
+                                    f"<div style='font-size:11px;color:#999;margin-top:6px;line-height:1.4'>{html.escape(m.get('context', ''))}</div>"
+                                    f"</div>",
+                                    unsafe_allow_html=True
+                                )
                     except Exception as e:
                         st.warning(f"Could not display metrics: {e}")
             
@@ -1171,13 +1160,14 @@ def main():
                 # ========== KEY FINDINGS ==========
                 st.markdown("#### 🔍 Key Findings & Insights")
                 if findings:
-                    findings_html = (
+                    parts = [
                         "<div style='background:#f0f7ff;padding:16px;border-radius:12px;border-left:4px solid #1565c0;'>"
                         "<ul style='margin:0;padding-left:20px;'>"
-                    )
-                    for finding in findings:
-                        findings_html += f"<li style='margin:8px 0;color:#1a1a1a;font-size:13px;line-height:1.6'>{html.escape(str(finding))}</li>"
-                    findings_html += "</ul></div>"
+                    ]
+                    _escape = html.escape
+                    parts.extend(f"{FINDING_LI_PREFIX}{_escape(str(finding))}{FINDING_LI_SUFFIX}" for finding in findings)
+                    parts.append("</ul></div>")
+                    findings_html = "".join(parts)
                     st.markdown(findings_html, unsafe_allow_html=True)
                 else:
                     st.write("—")
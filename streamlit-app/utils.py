@@ -1,15 +1,59 @@
 import os
 import time
 import json
+import queue
 import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from typing import Optional, Dict, Any, List
 
 import streamlit as st  # type: ignore
 from databricks.sdk.core import Config  # type: ignore
 
+try:
+    from orjson import loads as _json_loads  # type: ignore
+except ImportError:  # orjson is optional; stdlib json parses the same payloads
+    _json_loads = json.loads
+
 
 DEBUG_UC = (os.environ.get("UC_DEBUG", "false") or "").lower() in ("1", "true", "yes", "on")
 
+# Constant statement texts: brief_id is always bound as a parameter so the
+# warehouse sees identical SQL for every brief and can reuse its plan cache.
+COMPLIANCE_DECISION_SQL = """
+    SELECT 
+        brief_id, campaign_name, medical_legal_score, privacy_score,
+        brand_score, accessibility_score, content_score, overall_score,
+        approval_status, final_recommendation, reviewed_at, reviewed_by,
+        confidence_score, issues_json, issue_count, critical_count, high_count
+    FROM flo_martech.compliance_decisions
+    WHERE brief_id = ?
+    ORDER BY reviewed_at DESC
+    LIMIT 1
+"""
+
+# History rows only feed summaries, so skip the wide issues_json payload;
+# the full record for the latest decision comes from COMPLIANCE_DECISION_SQL.
+COMPLIANCE_HISTORY_SQL = """
+    SELECT
+        brief_id, campaign_name, medical_legal_score, privacy_score,
+        brand_score, accessibility_score, content_score, overall_score,
+        approval_status, reviewed_at, reviewed_by, confidence_score,
+        issue_count, critical_count, high_count
+    FROM flo_martech.compliance_decisions
+    WHERE brief_id = ?
+    ORDER BY reviewed_at DESC
+    LIMIT {limit}
+"""
+
+GENERATED_IMAGE_SQL = """
+    SELECT generated_image_b64
+    FROM flo_martech.generated_creatives
+    WHERE brief_id = ?
+    ORDER BY generation_timestamp DESC
+    LIMIT 1
+"""
+
 
 def normalize_brief(brief: dict, defaults: dict) -> dict:
     return {
@@ -21,101 +65,265 @@ def normalize_brief(brief: dict, defaults: dict) -> dict:
     }
 
 
-def get_handoff_output(params: Dict[str, Any]) -> Dict[str, Any]:
-    """
-    Returns realistic handoff data for demo purposes.
-    Includes go-live plan, channels, budget allocation, and monitoring metrics.
-    """
-    
-    campaign_brief_id = params.get("brief_id", "brief_001")
-    
-    # Campaign-specific handoff data
-    handoff_config = {
-        "brief_001": {
-            "readiness_status": "GO_LIVE",
-            "go_live_timestamp": "2025-01-15T08:00:00Z",
-            "channels": ["Instagram", "Facebook", "TikTok", "Google Ads"],
-            "budget_allocation": {
-                "instagram": "35%",
-                "facebook": "30%",
-                "tiktok": "20%",
-                "google_ads": "15%"
+# Campaign-specific handoff data
+HANDOFF_CONFIG: Dict[str, Dict[str, Any]] = {
+    "brief_001": {
+        "readiness_status": "GO_LIVE",
+        "go_live_timestamp": "2025-01-15T08:00:00Z",
+        "channels": ["Instagram", "Facebook", "TikTok", "Google Ads"],
+        "budget_allocation": {
+            "instagram": "35%",
+            "facebook": "30%",
+            "tiktok": "20%",
+            "google_ads": "15%"
+        },
+        "monitoring_metrics": [
+            "CTR (Target: >1.2%)",
+            "Conversion Rate (Target: >4.5%)",
+            "ROAS (Target: >3.5x)",
+            "Cost per Install (Target: <$2.50)",
+            "User Retention Day 7 (Target: >40%)"
+        ],
+        "assignees": {
+            "instagram": "Sarah Chen (Media)",
+            "facebook": "Alex Novak (Paid Social)",
+            "tiktok": "Priya Patel (Creator Partnerships)",
+            "google_ads": "Mark Li (Search)"
+        },
+        "campaign_assets_ready": True,
+        "tracking_configured": True,
+        "stakeholders_notified": True
+    },
+    "brief_002": {
+        "readiness_status": "GO_LIVE",
+        "go_live_timestamp": "2025-01-22T10:00:00Z",
+        "channels": ["Email", "Instagram", "Facebook", "Tiktok"],
+        "budget_allocation": {
+            "email": "25%",
+            "instagram": "40%",
+            "facebook": "20%",
+            "tiktok": "15%"
+        },
+        "monitoring_metrics": [
+            "Email Open Rate (Target: >28%)",
+            "Click-through Rate (Target: >3.5%)",
+            "Conversion Rate (Target: >6.2%)",
+            "ROAS (Target: >4.0x)",
+            "Customer Lifetime Value (Target: >$185)"
+        ],
+        "assignees": {
+            "email": "Emma Davis (CRM)",
+            "instagram": "Alex Novak (Paid Social)",
+            "facebook": "Jamie Wright (Paid Social)",
+            "Tiktok": "Linda Gómez (Creative Ops)"
+        },
+        "campaign_assets_ready": True,
+        "tracking_configured": True,
+        "stakeholders_notified": True
+    },
+    "brief_003": {
+        "readiness_status": "PENDING",
+        "go_live_timestamp": "2025-02-05T09:00:00Z",
+        "channels": ["Instagram", "Facebook", "YouTube", "Search Ads"],
+        "budget_allocation": {
+            "instagram": "30%",
+            "facebook": "25%",
+            "youtube": "25%",
+            "search_ads": "20%"
+        },
+        "monitoring_metrics": [
+            "View-through Rate (Target: >2.1%)",
+            "Engagement Rate (Target: >5.8%)",
+            "Conversion Rate (Target: >5.0%)",
+            "ROAS (Target: >3.2x)",
+            "Video Completion Rate (Target: >65%)"
+        ],
+        "assignees": {
+            "instagram": "Mina Rao (Paid Social)",
+            "facebook": "Jamie Wright (Paid Social)",
+            "youtube": "Chris Park (Video)",
+            "search_ads": "Mark Li (Search)"
+        },
+        "campaign_assets_ready": False,
+        "tracking_configured": True,
+        "stakeholders_notified": False
+    }
+}
+
+# Campaign-specific performance scenarios
+ANALYSIS_SCENARIOS: Dict[str, Dict[str, Any]] = {
+    "brief_001": {  # Women's Health Awareness - Acquisition
+        "performance_metrics": [
+            {
+                "metric": "Click-Through Rate",
+                "value": 1.42,
+                "benchmark": 1.2,
+                "status": "↑ +18%",
+                "context": "Above industry average for health apps"
             },
-            "monitoring_metrics": [
-                "CTR (Target: >1.2%)",
-                "Conversion Rate (Target: >4.5%)",
-                "ROAS (Target: >3.5x)",
-                "Cost per Install (Target: <$2.50)",
-                "User Retention Day 7 (Target: >40%)"
-            ],
-            "assignees": {
-                "instagram": "Sarah Chen (Media)",
-                "facebook": "Alex Novak (Paid Social)",
-                "tiktok": "Priya Patel (Creator Partnerships)",
-                "google_ads": "Mark Li (Search)"
+            {
+                "metric": "Cost Per Install",
+                "value": 2.15,
+                "benchmark": 2.5,
+                "status": "↓ -14%",
+                "context": "Better than benchmark, efficient spend"
             },
-            "campaign_assets_ready": True,
-            "tracking_configured": True,
-            "stakeholders_notified": True
-        },
-        "brief_002": {
-            "readiness_status": "GO_LIVE",
-            "go_live_timestamp": "2025-01-22T10:00:00Z",
-            "channels": ["Email", "Instagram", "Facebook", "Tiktok"],
-            "budget_allocation": {
-                "email": "25%",
-                "instagram": "40%",
-                "facebook": "20%",
-                "tiktok": "15%"
+            {
+                "metric": "7-Day Retention",
+                "value": 48.3,
+                "benchmark": 45.0,
+                "status": "↑ +7.3%",
+                "context": "Strong early engagement signals"
             },
-            "monitoring_metrics": [
-                "Email Open Rate (Target: >28%)",
-                "Click-through Rate (Target: >3.5%)",
-                "Conversion Rate (Target: >6.2%)",
-                "ROAS (Target: >4.0x)",
-                "Customer Lifetime Value (Target: >$185)"
-            ],
-            "assignees": {
-                "email": "Emma Davis (CRM)",
-                "instagram": "Alex Novak (Paid Social)",
-                "facebook": "Jamie Wright (Paid Social)",
-                "Tiktok": "Linda Gómez (Creative Ops)"
+            {
+                "metric": "Install Volume",
+                "value": 12450,
+                "benchmark": 10000,
+                "status": "↑ +24.5%",
+                "context": "Exceeded initial targets"
             },
-            "campaign_assets_ready": True,
-            "tracking_configured": True,
-            "stakeholders_notified": True
-        },
-        "brief_003": {
-            "readiness_status": "PENDING",
-            "go_live_timestamp": "2025-02-05T09:00:00Z",
-            "channels": ["Instagram", "Facebook", "YouTube", "Search Ads"],
-            "budget_allocation": {
-                "instagram": "30%",
-                "facebook": "25%",
-                "youtube": "25%",
-                "search_ads": "20%"
+            {
+                "metric": "Cost Per Mille (CPM)",
+                "value": 8.75,
+                "benchmark": 9.2,
+                "status": "↓ -5%",
+                "context": "Efficient media buying"
+            }
+        ],
+        "key_findings": [
+            "Instagram and TikTok driving 68% of installs (highest ROI channels)",
+            "Video creative (20s) outperforms carousel ads by 34%",
+            "Women 25-30 segment shows 42% higher LTV than 18-24",
+            "Peak engagement occurs Tuesday-Thursday, 7-9 PM",
+            "User flow optimization increased conversion by 12%"
+        ],
+        "next_iteration_brief": {
+            "focus": "Scale winning creative + expand to lookalike audiences",
+            "recommended_budget_shift": "Increase TikTok from 30% → 40%, reduce Tiktok 10% → 5%",
+            "creative_strategy": "Test 15s vertical format, double down on educational content",
+            "targeting_expansion": "Expand to +35 segment, test interest overlap with wellness apps",
+            "timeline": "Week 3-4 of campaign"
+        }
+    },
+    "brief_002": {  # Menopause Support - Retention
+        "performance_metrics": [
+            {
+                "metric": "Email Open Rate",
+                "value": 28.5,
+                "benchmark": 25.0,
+                "status": "↑ +14%",
+                "context": "Strong subject line performance"
+            },
+            {
+                "metric": "In-App Engagement",
+                "value": 3.2,
+                "benchmark": 2.5,
+                "status": "↑ +28%",
+                "context": "Users spending more time with features"
+            },
+            {
+                "metric": "Re-activation Rate",
+                "value": 18.7,
+                "benchmark": 12.0,
+                "status": "↑ +56%",
+                "context": "Win-back campaign highly effective"
+            },
+            {
+                "metric": "Customer Lifetime Value (CLTV)",
+                "value": 245.80,
+                "benchmark": 180.0,
+                "status": "↑ +36.5%",
+                "context": "Retention strategy improving LTV significantly"
+            },
+            {
+                "metric": "Churn Rate",
+                "value": 4.2,
+                "benchmark": 6.5,
+                "status": "↓ -35%",
+                "context": "Lower than expected churn"
+            }
+        ],
+        "key_findings": [
+            "Educational content (expert Q&A) drives 2.8x higher engagement than promotional",
+            "Email cadence of 2x/week optimal; 3x/week shows 15% increase in unsubscribes",
+            "In-app feature adoption: 67% users access community, 54% use symptom tracker",
+            "Retention cohort from menopause content shows 23% higher LTV",
+            "Personalized recommendations increase session length by 34%"
+        ],
+        "next_iteration_brief": {
+            "focus": "Deepen engagement through community features + expert partnerships",
+            "recommended_budget_shift": "Reallocate 10% from Facebook to in-app experience improvements",
+            "creative_strategy": "Feature community stories, expert testimonials, symptom management tools",
+            "targeting_expansion": "Expand to perimenopause audience (40-45), partner with OB-GYN practices",
+            "timeline": "Weeks 5-8 of campaign"
+        }
+    },
+    "brief_003": {  # Pregnancy Planning - Engagement
+        "performance_metrics": [
+            {
+                "metric": "Video Completion Rate",
+                "value": 67.8,
+                "benchmark": 60.0,
+                "status": "↑ +13%",
+                "context": "Strong video content performance"
             },
-            "monitoring_metrics": [
-                "View-through Rate (Target: >2.1%)",
-                "Engagement Rate (Target: >5.8%)",
-                "Conversion Rate (Target: >5.0%)",
-                "ROAS (Target: >3.2x)",
-                "Video Completion Rate (Target: >65%)"
-            ],
-            "assignees": {
-                "instagram": "Mina Rao (Paid Social)",
-                "facebook": "Jamie Wright (Paid Social)",
-                "youtube": "Chris Park (Video)",
-                "search_ads": "Mark Li (Search)"
+            {
+                "metric": "Email Signup Rate",
+                "value": 8.4,
+                "benchmark": 6.5,
+                "status": "↑ +29%",
+                "context": "Educational series converting well"
             },
-            "campaign_assets_ready": False,
-            "tracking_configured": True,
-            "stakeholders_notified": False
+            {
+                "metric": "Content Engagement Rate",
+                "value": 4.6,
+                "benchmark": 3.2,
+                "status": "↑ +44%",
+                "context": "Educational focus resonates"
+            },
+            {
+                "metric": "Series Completion Rate",
+                "value": 72.5,
+                "benchmark": 55.0,
+                "status": "↑ +32%",
+                "context": "High interest in educational journey"
+            },
+            {
+                "metric": "Social Share Rate",
+                "value": 12.3,
+                "benchmark": 8.0,
+                "status": "↑ +54%",
+                "context": "Highly shareable content"
+            }
+        ],
+        "key_findings": [
+            "YouTube channel driving 89% of views and 92% of email signups",
+            "3-part educational series on pregnancy timeline most popular (145K views)",
+            "Audience age: 28-35 shows 3.2x higher engagement than 25-28",
+            "Instagram carousel posts (timeline infographics) get 4.8x more saves",
+            "Content about 'what to expect' generates 2.1x more comments than symptom posts"
+        ],
+        "next_iteration_brief": {
+            "focus": "Expand educational video series + build community around journey",
+            "recommended_budget_shift": "Increase YouTube from 35% → 45%, reduce TikTok 15% → 8%",
+            "creative_strategy": "Launch 'Your Pregnancy Timeline' video series (8 episodes), add expert interviews",
+            "targeting_expansion": "Add couples demographic, women planning pregnancy (no current pregnancy)",
+            "timeline": "Weeks 6-10 of campaign"
         }
     }
+}
+
+
+def get_handoff_output(params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Returns realistic handoff data for demo purposes.
+    Includes go-live plan, channels, budget allocation, and monitoring metrics.
+    """
+    
+    campaign_brief_id = params.get("brief_id", "brief_001")
     
     # Get config for this campaign, or use brief_001 as fallback
-    config = handoff_config.get(campaign_brief_id, handoff_config["brief_001"])
+    config = HANDOFF_CONFIG.get(campaign_brief_id, HANDOFF_CONFIG["brief_001"])
     
     return {
         "output": {
@@ -139,171 +347,8 @@ def get_analysis_output(params: dict) -> dict:
     """
     brief_id = params.get("brief_id") or ""
     
-    # Campaign-specific performance scenarios
-    analysis_scenarios = {
-        "brief_001": {  # Women's Health Awareness - Acquisition
-            "performance_metrics": [
-                {
-                    "metric": "Click-Through Rate",
-                    "value": 1.42,
-                    "benchmark": 1.2,
-                    "status": "↑ +18%",
-                    "context": "Above industry average for health apps"
-                },
-                {
-                    "metric": "Cost Per Install",
-                    "value": 2.15,
-                    "benchmark": 2.5,
-                    "status": "↓ -14%",
-                    "context": "Better than benchmark, efficient spend"
-                },
-                {
-                    "metric": "7-Day Retention",
-                    "value": 48.3,
-                    "benchmark": 45.0,
-                    "status": "↑ +7.3%",
-                    "context": "Strong early engagement signals"
-                },
-                {
-                    "metric": "Install Volume",
-                    "value": 12450,
-                    "benchmark": 10000,
-                    "status": "↑ +24.5%",
-                    "context": "Exceeded initial targets"
-                },
-                {
-                    "metric": "Cost Per Mille (CPM)",
-                    "value": 8.75,
-                    "benchmark": 9.2,
-                    "status": "↓ -5%",
-                    "context": "Efficient media buying"
-                }
-            ],
-            "key_findings": [
-                "Instagram and TikTok driving 68% of installs (highest ROI channels)",
-                "Video creative (20s) outperforms carousel ads by 34%",
-                "Women 25-30 segment shows 42% higher LTV than 18-24",
-                "Peak engagement occurs Tuesday-Thursday, 7-9 PM",
-                "User flow optimization increased conversion by 12%"
-            ],
-            "next_iteration_brief": {
-                "focus": "Scale winning creative + expand to lookalike audiences",
-                "recommended_budget_shift": "Increase TikTok from 30% → 40%, reduce Tiktok 10% → 5%",
-                "creative_strategy": "Test 15s vertical format, double down on educational content",
-                "targeting_expansion": "Expand to +35 segment, test interest overlap with wellness apps",
-                "timeline": "Week 3-4 of campaign"
-            }
-        },
-        "brief_002": {  # Menopause Support - Retention
-            "performance_metrics": [
-                {
-                    "metric": "Email Open Rate",
-                    "value": 28.5,
-                    "benchmark": 25.0,
-                    "status": "↑ +14%",
-                    "context": "Strong subject line performance"
-                },
-                {
-                    "metric": "In-App Engagement",
-                    "value": 3.2,
-                    "benchmark": 2.5,
-                    "status": "↑ +28%",
-                    "context": "Users spending more time with features"
-                },
-                {
-                    "metric": "Re-activation Rate",
-                    "value": 18.7,
-                    "benchmark": 12.0,
-                    "status": "↑ +56%",
-                    "context": "Win-back campaign highly effective"
-                },
-                {
-                    "metric": "Customer Lifetime Value (CLTV)",
-                    "value": 245.80,
-                    "benchmark": 180.0,
-                    "status": "↑ +36.5%",
-                    "context": "Retention strategy improving LTV significantly"
-                },
-                {
-                    "metric": "Churn Rate",
-                    "value": 4.2,
-                    "benchmark": 6.5,
-                    "status": "↓ -35%",
-                    "context": "Lower than expected churn"
-                }
-            ],
-            "key_findings": [
-                "Educational content (expert Q&A) drives 2.8x higher engagement than promotional",
-                "Email cadence of 2x/week optimal; 3x/week shows 15% increase in unsubscribes",
-                "In-app feature adoption: 67% users access community, 54% use symptom tracker",
-                "Retention cohort from menopause content shows 23% higher LTV",
-                "Personalized recommendations increase session length by 34%"
-            ],
-            "next_iteration_brief": {
-                "focus": "Deepen engagement through community features + expert partnerships",
-                "recommended_budget_shift": "Reallocate 10% from Facebook to in-app experience improvements",
-                "creative_strategy": "Feature community stories, expert testimonials, symptom management tools",
-                "targeting_expansion": "Expand to perimenopause audience (40-45), partner with OB-GYN practices",
-                "timeline": "Weeks 5-8 of campaign"
-            }
-        },
-        "brief_003": {  # Pregnancy Planning - Engagement
-            "performance_metrics": [
-                {
-                    "metric": "Video Completion Rate",
-                    "value": 67.8,
-                    "benchmark": 60.0,
-                    "status": "↑ +13%",
-                    "context": "Strong video content performance"
-                },
-                {
-                    "metric": "Email Signup Rate",
-                    "value": 8.4,
-                    "benchmark": 6.5,
-                    "status": "↑ +29%",
-                    "context": "Educational series converting well"
-                },
-                {
-                    "metric": "Content Engagement Rate",
-                    "value": 4.6,
-                    "benchmark": 3.2,
-                    "status": "↑ +44%",
-                    "context": "Educational focus resonates"
-                },
-                {
-                    "metric": "Series Completion Rate",
-                    "value": 72.5,
-                    "benchmark": 55.0,
-                    "status": "↑ +32%",
-                    "context": "High interest in educational journey"
-                },
-                {
-                    "metric": "Social Share Rate",
-                    "value": 12.3,
-                    "benchmark": 8.0,
-                    "status": "↑ +54%",
-                    "context": "Highly shareable content"
-                }
-            ],
-            "key_findings": [
-                "YouTube channel driving 89% of views and 92% of email signups",
-                "3-part educational series on pregnancy timeline most popular (145K views)",
-                "Audience age: 28-35 shows 3.2x higher engagement than 25-28",
-                "Instagram carousel posts (timeline infographics) get 4.8x more saves",
-                "Content about 'what to expect' generates 2.1x more comments than symptom posts"
-            ],
-            "next_iteration_brief": {
-                "focus": "Expand educational video series + build community around journey",
-                "recommended_budget_shift": "Increase YouTube from 35% → 45%, reduce TikTok 15% → 8%",
-                "creative_strategy": "Launch 'Your Pregnancy Timeline' video series (8 episodes), add expert interviews",
-                "targeting_expansion": "Add couples demographic, women planning pregnancy (no current pregnancy)",
-                "timeline": "Weeks 6-10 of campaign"
-            }
-        }
-    }
-    
     # Get scenario for the brief
-    scenario = analysis_scenarios.get(brief_id, analysis_scenarios.get("brief_001"))
+    scenario = ANALYSIS_SCENARIOS.get(brief_id, ANALYSIS_SCENARIOS["brief_001"])
     
     return {
         "output": {
@@ -344,16 +389,85 @@ def get_databricks_connection():
         return None
 
 
-@st.cache_data(ttl=300, show_spinner=False)
+# Cache lifetimes follow write cadence: compliance decisions are re-reviewed and must
+# surface quickly, while a generated creative row is written once per generation.
+# persist="disk" is not used because Streamlit ignores ttl for persisted caches.
+UC_DECISION_TTL_S = 120
+UC_CREATIVE_TTL_S = 3600
+
+# Independent lookups (e.g. compliance decision + generated image) run concurrently,
+# so keep a few warm connections rather than a single serialized one.
+UC_POOL_SIZE = 4
+# Upper bound on history rows fetched per brief, whatever the caller asks for
+UC_HISTORY_MAX_ROWS = 200
+
+
+@st.cache_resource(show_spinner=False)
+def _connection_pool():
+    """
+    Process-wide pool of idle warehouse connections instead of a TLS/auth handshake
+    per query. The connector's connections are not thread-safe, so each one is
+    lent to a single cursor at a time; the semaphore bounds open connections.
+    """
+    return queue.LifoQueue(maxsize=UC_POOL_SIZE), threading.BoundedSemaphore(UC_POOL_SIZE)
+
+
+@st.cache_resource(show_spinner=False)
+def uc_executor() -> ThreadPoolExecutor:
+    """Shared worker pool for overlapping independent UC round-trips."""
+    return ThreadPoolExecutor(max_workers=UC_POOL_SIZE, thread_name_prefix="uc")
+
+
+@contextmanager
+def uc_cursor():
+    """Borrow a cursor on a pooled connection; yields None when UC is unreachable."""
+    idle, slots = _connection_pool()
+    with slots:
+        try:
+            conn = idle.get_nowait()
+        except queue.Empty:
+            conn = get_databricks_connection()
+        if not conn:
+            yield None
+            return
+        cursor = conn.cursor()
+        try:
+            yield cursor
+        except Exception:
+            # Discard the (possibly broken) connection so the next borrower reconnects
+            for handle in (cursor, conn):
+                try:
+                    handle.close()
+                except Exception:
+                    pass
+            raise
+        try:
+            cursor.close()
+        except Exception:
+            pass
+        idle.put_nowait(conn)
+
+
+def _parse_issues(raw_issues: Any) -> List[Dict[str, Any]]:
+    try:
+        if isinstance(raw_issues, (str, bytes)) and raw_issues.strip():
+            parsed = _json_loads(raw_issues)
+            return parsed if isinstance(parsed, list) else []
+        if isinstance(raw_issues, list):
+            return raw_issues
+    except Exception:
+        pass
+    return []
+
+
+@st.cache_data(ttl=UC_DECISION_TTL_S, show_spinner=False)
 def get_compliance_from_uc(brief_id: str) -> Dict[str, Any]:
     try:
         logs: List[str] = []
         t0 = time.time()
-        conn = get_databricks_connection()
-        if not conn:
-            return {}
-        try:
-            cursor = conn.cursor()
+        with uc_cursor() as cursor:
+            if cursor is None:
+                return {}
             if DEBUG_UC:
                 logs.append("cursor_opened")
                 try:
@@ -362,32 +476,10 @@ def get_compliance_from_uc(brief_id: str) -> Dict[str, Any]:
                     logs.append("select_1_ok")
                 except Exception as e:
                     logs.append(f"select_1_failed:{e}")
-            cursor.execute(
-                """
-                SELECT 
-                    brief_id, campaign_name, medical_legal_score, privacy_score,
-                    brand_score, accessibility_score, content_score, overall_score,
-                    approval_status, final_recommendation, reviewed_at, reviewed_by,
-                    confidence_score, issues_json, issue_count, critical_count, high_count
-                FROM flo_martech.compliance_decisions
-                WHERE brief_id = ?
-                ORDER BY reviewed_at DESC
-                LIMIT 1
-                """,
-                (brief_id,)
-            )
+            cursor.execute(COMPLIANCE_DECISION_SQL, (brief_id,))
             result = cursor.fetchone()
             if DEBUG_UC:
                 logs.append(f"fetchone_done:{'hit' if bool(result) else 'miss'}")
-        finally:
-            try:
-                cursor.close()
-            except Exception:
-                pass
-            try:
-                conn.close()
-            except Exception:
-                pass
         if not result:
             if DEBUG_UC:
                 st.write({"uc_fetch_ms": int((time.time()-t0)*1000), "debug": logs, "brief_id": brief_id})
@@ -413,6 +505,8 @@ def get_compliance_from_uc(brief_id: str) -> Dict[str, Any]:
             "reviewed_by": r_reviewed_by,
             "confidence_score": float(r_conf or 0.0),
             "issues_json": r_issues_json,
+            # Parsed once here so reruns reuse the cached list instead of re-decoding JSON
+            "issues": _parse_issues(r_issues_json),
             "issue_count": int(r_issue_count or 0),
             "critical_count": int(r_critical_count or 0),
             "high_count": int(r_high_count or 0)
@@ -457,42 +551,19 @@ def get_compliance_from_uc_timeout(brief_id: str, timeout: int = 8) -> Dict[str,
     return res or {}
 
 
-@st.cache_data(ttl=300, show_spinner=False)
+@st.cache_data(ttl=UC_DECISION_TTL_S, show_spinner=False)
 def get_compliance_history_from_uc(brief_id: str, limit: int = 5):
     try:
-        conn = get_databricks_connection()
-        if not conn:
-            return []
-        try:
-            cursor = conn.cursor()
-            cursor.execute(
-                f"""
-                SELECT *
-                FROM flo_martech.compliance_decisions
-                WHERE brief_id = ?
-                ORDER BY reviewed_at DESC
-                LIMIT {int(limit)}
-                """,
-                (brief_id,)
-            )
+        with uc_cursor() as cursor:
+            if cursor is None:
+                return []
+            cursor.execute(COMPLIANCE_HISTORY_SQL.format(limit=max(1, min(int(limit), UC_HISTORY_MAX_ROWS))), (brief_id,))
+            if hasattr(cursor, "fetchall_arrow"):
+                # Columnar decode straight from the result batches; no per-row tuples
+                return cursor.fetchall_arrow().to_pylist()
             rows = cursor.fetchall()
             colnames = [d[0] for d in cursor.description] if cursor.description else []
-        finally:
-            try:
-                cursor.close()
-            except Exception:
-                pass
-            try:
-                conn.close()
-            except Exception:
-                pass
-        results = []
-        for r in rows or []:
-            try:
-                results.append({colnames[i]: r[i] for i in range(len(colnames))})
-            except Exception:
-                pass
-        return results
+        return [dict(zip(colnames, r)) for r in rows or []]
     except Exception as e:
         st.warning(f"UC history query failed: {e}")
         return []
@@ -514,15 +585,9 @@ def get_assignee_for_category(category: str) -> str:
 
 
 def generate_approval_checklist_from_compliance(compliance: Dict[str, Any]) -> Dict[str, Any]:
-    try:
-        issues_all = []
-        raw_issues = compliance.get("issues_json")
-        if isinstance(raw_issues, str) and raw_issues.strip():
-            issues_all = json.loads(raw_issues)
-        elif isinstance(raw_issues, list):
-            issues_all = raw_issues
-    except Exception:
-        issues_all = []
+    issues_all = compliance.get("issues")
+    if issues_all is None:
+        issues_all = _parse_issues(compliance.get("issues_json"))
     critical_high = [
         i for i in (issues_all or [])
         if str(i.get("severity", "")).upper() in ("CRITICAL", "HIGH")
@@ -547,34 +612,14 @@ def generate_approval_checklist_from_compliance(compliance: Dict[str, Any]) -> D
     }
 
 
-@st.cache_data(ttl=300, show_spinner=False)
+@st.cache_data(ttl=UC_CREATIVE_TTL_S, max_entries=64, show_spinner=False)
 def get_generated_image_b64_from_uc(brief_id: str) -> Optional[str]:
     try:
-        conn = get_databricks_connection()
-        if not conn:
-            return None
-        try:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                SELECT generated_image_b64
-                FROM flo_martech.generated_creatives
-                WHERE brief_id = ?
-                ORDER BY generation_timestamp DESC
-                LIMIT 1
-                """,
-                (brief_id,)
-            )
+        with uc_cursor() as cursor:
+            if cursor is None:
+                return None
+            cursor.execute(GENERATED_IMAGE_SQL, (brief_id,))
             row = cursor.fetchone()
-        finally:
-            try:
-                cursor.close()
-            except Exception:
-                pass
-            try:
-                conn.close()
-            except Exception:
-                pass
         if row and row[0]:
             return row[0]
         return None